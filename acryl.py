@@ -1,8 +1,27 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-import altair as alt
+import os
+import shutil
+import threading
+from datetime import datetime
+from html import escape
+from pathlib import Path
+
+from calibration import POOLED, calibrate, comparables_path, read_comparables, seed_scenarios
+from companies import companies_path, file_digest
+from engine import KEY_VALUES, SCENARIOS, SENSITIVITY_RANGE, compute_arr, downsample, downsample_axis, project_arr, scenario_matrix, sensitivity_surface
+from history import HeadcountHistory, TrajectoryCache, history_dir
+from lookup import ArrLookup, lookup_dir
+from montecarlo import DISTRIBUTIONS, coarsen, company_bands, quantiles, simulate
+from reports import ReportJob, company_jobs, render, report_pool, reports_dir
+from scenario_store import Scenario, ScenarioStore, compare, store_path
+from watch import ScenarioResultsCache, WatchedCompanies
+import payload
+import profiling
+import shared_cache
+from shared_cache import read_only, shared_data, shared_resource
+from tables import paged_table
 
 # Set page configuration and styling
 st.set_page_config(
@@ -12,6 +31,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Opt-in section timings and payload sizes (?profile=1 or ACRYL_PROFILE=1)
+profiling.begin(section="header")
+# Chart bytes sent this run; large charts aggregate once it runs out (ACRYL_CHART_BUDGET_KB)
+payload.begin()
+
 # Define colors for both themes
 primary_color = "#4F46E5"  # Bright indigo that works in both modes
 card_background = "#FFFFFF"  # Light mode card background
@@ -21,140 +45,27 @@ text_color_dark = "#111827"  # Dark text for light backgrounds
 border_color = "#E5E7EB"  # Light border
 dark_border_color = "#4B5563"  # Dark border
 
-# Company colors that are visible in both themes
-collibra_color = "#818CF8"  # Bright indigo
-alation_color = "#38BDF8"  # Bright sky blue
-
 # Scenario colors that work in both themes
 bear_color = "#F87171"  # Bright red
 base_color = "#4ADE80"  # Bright green
 bull_color = "#60A5FA"  # Bright blue
 
 # Custom CSS with explicit backgrounds for both themes
-st.markdown("""
-<style>
-    /* Light mode (default) */
-    .main-header {
-        font-size: 2.5rem;
-        color: #4F46E5;
-        margin-bottom: 1.5rem;
-        text-align: center;
-        padding: 1rem 0;
-        border-bottom: 2px solid #E5E7EB;
-    }
-    .section-header {
-        color: #4F46E5;
-        padding-top: 1rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 1px solid #E5E7EB;
-        margin-bottom: 1rem;
-    }
-    .company-card {
-        background-color: #FFFFFF;
-        padding: 1.5rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.12), 0 1px 2px rgba(0,0,0,0.24);
-    }
-    .chart-container {
-        background-color: #FFFFFF;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.12), 0 1px 2px rgba(0,0,0,0.24);
-    }
-    .metrics-container {
-        display: flex;
-        justify-content: space-between;
-        flex-wrap: wrap;
-        margin-bottom: 1rem;
-    }
-    .metric-card {
-        background-color: #FFFFFF;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.12), 0 1px 2px rgba(0,0,0,0.24);
-        text-align: center;
-    }
-    .footer {
-        text-align: center;
-        padding: 1.5rem 0;
-        border-top: 1px solid #E5E7EB;
-        margin-top: 2rem;
-        font-size: 0.875rem;
-    }
-    .scenario-label {
-        font-weight: bold;
-        margin-bottom: 0.25rem;
-    }
-    .dataframe-container {
-        border-radius: 0.5rem;
-        overflow: hidden;
-        margin-bottom: 1rem;
-    }
-    .info-box {
-        background-color: #EFF6FF;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 2rem;
-        border-left: 4px solid #4F46E5;
-        color: #111827;
-    }
-    
-    /* Dark mode overrides */
-    [data-testid="stApp"][data-theme="dark"] .main-header {
-        border-bottom-color: #4B5563;
-    }
-    [data-testid="stApp"][data-theme="dark"] .section-header {
-        border-bottom-color: #4B5563;
-    }
-    [data-testid="stApp"][data-theme="dark"] .company-card {
-        background-color: #262730;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.24), 0 1px 2px rgba(0,0,0,0.36);
-    }
-    [data-testid="stApp"][data-theme="dark"] .chart-container {
-        background-color: #262730;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.24), 0 1px 2px rgba(0,0,0,0.36);
-    }
-    [data-testid="stApp"][data-theme="dark"] .metric-card {
-        background-color: #262730;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.24), 0 1px 2px rgba(0,0,0,0.36);
-    }
-    [data-testid="stApp"][data-theme="dark"] .footer {
-        border-top-color: #4B5563;
-    }
-    /* Ensure info-box is readable in dark mode */
-    [data-testid="stApp"][data-theme="dark"] .info-box {
-        background-color: #1E293B;
-        border-left-color: #818CF8;
-        color: #F9FAFB !important;
-    }
-    
-    /* Ensure text in key containers is legible */
-    [data-testid="stApp"][data-theme="dark"] .company-card h3,
-    [data-testid="stApp"][data-theme="dark"] .company-card p,
-    [data-testid="stApp"][data-theme="dark"] .company-card div,
-    [data-testid="stApp"][data-theme="dark"] .chart-container h3,
-    [data-testid="stApp"][data-theme="dark"] .chart-container p,
-    [data-testid="stApp"][data-theme="dark"] .info-box p {
-        color: #F9FAFB !important;
-    }
-    
-    /* Make metric cards more visible in dark mode */
-    [data-testid="stApp"][data-theme="dark"] div[data-testid="metric-container"] {
-        background-color: #262730;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.24), 0 1px 2px rgba(0,0,0,0.36);
-    }
-    
-    /* Handle dataframe styling */
-    [data-testid="stApp"][data-theme="dark"] .dataframe {
-        color: #F9FAFB;
-    }
-</style>
-""", unsafe_allow_html=True)
+STYLESHEET = Path(__file__).parent / "static" / "acryl.css"
+
+
+# Read once per process for the inline fallback
+@st.cache_resource
+def inline_stylesheet():
+    return f"<style>\n{STYLESHEET.read_text()}</style>"
+
+
+# With static serving the browser fetches and caches the stylesheet once; each rerun only
+# re-sends a one-line link. Without it, fall back to inlining the file.
+if st.get_option("server.enableStaticServing"):
+    st.markdown('<link rel="stylesheet" href="./app/static/acryl.css">', unsafe_allow_html=True)
+else:
+    st.markdown(inline_stylesheet(), unsafe_allow_html=True)
 
 # App header
 st.markdown('<h1 class="main-header">Data Analytics Company ARR Estimator</h1>', unsafe_allow_html=True)
@@ -162,19 +73,284 @@ st.markdown('<h1 class="main-header">Data Analytics Company ARR Estimator</h1>',
 # App description with theme-compatible styling
 st.markdown("""
 <div class="info-box">
-    <p style="margin: 0;">This interactive dashboard estimates the Annual Recurring Revenue (ARR) for <b>Collibra</b> and <b>Alation</b> based on their number of Full-Time Equivalent (FTE) employees and configurable revenue per employee ratios. Use the controls in the sidebar to adjust scenarios and view the impact on estimated ARR.</p>
+    <p style="margin: 0;">This interactive dashboard estimates the Annual Recurring Revenue (ARR) for the tracked competitors based on their number of Full-Time Equivalent (FTE) employees and configurable revenue per employee ratios. Use the controls in the sidebar to adjust scenarios and view the impact on estimated ARR.</p>
 </div>
 """, unsafe_allow_html=True)
 
+
+# Data derived from the shared inputs (company file, slider steps) is cached process-wide,
+# so every session at the same slider positions reuses one computation.
+
+# One watcher per company file and process, shared by every session without copying (never
+# mutated). Its thread re-reads the file when the scraper rewrites it; reruns only read a snapshot.
+@st.cache_resource(show_spinner="Loading competitor data...")
+def watch_companies(path):
+    return WatchedCompanies(path).start()
+
+
+# Seconds between each session's check for a newer company table
+DATA_POLL_SECONDS = 10
+
+
+# Cached per parameter tuple so returning a slider to a previous value is instant
+@shared_data(max_entries=64, show_spinner="Running Monte Carlo simulation...")
+def simulate_arr_per_fte(distribution, bear, base, bull, fte_spread, draws, seed):
+    return simulate(distribution, bear, base, bull, fte_spread=fte_spread, draws=draws, seed=seed)
+
+
+# Companies x quarters x scenarios in one broadcast, cached per parameter tuple and shared read-only
+@shared_resource(max_entries=32, show_spinner="Projecting ARR...")
+def projection_cube(fte, fte_growth, arr_per_fte, drift, quarters):
+    return read_only(project_arr(fte, arr_per_fte, fte_growth, drift, quarters))
+
+
+# Chart specs memoized on the builder and the inputs that shape it; unchanged charts skip
+# Altair building and serialization. Altair is only imported on the first cache miss.
+@shared_data(max_entries=1024, name="chart_spec", show_spinner=False)
+def cached_chart_spec(builder, *args):
+    import charts
+    return charts.compact(getattr(charts, builder)(*args))
+
+
+def chart_spec(builder, *args):
+    with profiling.section(f"spec:{builder}"):
+        spec = cached_chart_spec(builder, *args)
+        payload.charge(spec)
+        return spec
+
+
+# Approximate bytes per data row of the charts that aggregate under the budget
+# (8 per number, 4 per dictionary-encoded label)
+ROW_BYTES = {"sensitivity": 20, "sensitivity_surface": 24, "arr_histograms": 28, "arr_per_fte_histogram": 24, "arr_trajectory": 36,
+             "arr_projection": 36}
+
+
+def budget_count(builder, per_row, wanted, minimum=2):
+    """How many of ``wanted`` steps (each ``per_row`` rows) chart ``builder`` may send this run."""
+    per_row = max(per_row, 1)
+    return payload.rows(builder, wanted * per_row, ROW_BYTES[builder], minimum * per_row) // per_row
+
+
+def thinned(builder, per_row, count):
+    """Positions of the ``count`` time steps chart ``builder`` may send, always keeping the last."""
+    stride = -(-count // max(budget_count(builder, per_row, count), 1))
+    return np.arange(count - 1, -1, -stride)[::-1]
+
+
+# Bootstrap fit of the comparables file, recomputed only when its content changes
+@shared_data(max_entries=8, show_spinner="Calibrating ARR per FTE...")
+def calibration_fit(path, digest, resamples, confidence):
+    return calibrate(read_comparables(path), resamples, confidence)
+
+
+# Precomputed ARR at every slider step (python lookup.py build), mapped once per table build;
+# None when the company file has no table yet
+@shared_resource(max_entries=8, show_spinner=False)
+def open_lookup(directory, digest, n_companies, built_ns):
+    return ArrLookup.open(directory, digest, n_companies)
+
+
+def lookup_table(digest, n_companies):
+    directory = lookup_dir()
+    try:
+        built_ns = os.stat(directory / f"{digest}.json").st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return open_lookup(str(directory), digest, n_companies, built_ns)
+
+
+# Scenarios x companies ARR per (scenario values, overrides), shared read-only. A newer company
+# table patches cached frames (only changed companies are recomputed) instead of flushing them.
+@st.cache_resource
+def results_cache():
+    return ScenarioResultsCache(on_call=lambda: shared_cache.STATS.call("scenario_results"),
+                                on_miss=lambda: shared_cache.STATS.miss("scenario_results"))
+
+
+def scenario_results(path, snapshot, scenario_values, overrides):
+    # A full miss reads rows from the lookup table when there is one, else broadcasts;
+    # the Custom column carries the tracked companies' overrides
+    _, _, digest = snapshot
+
+    def from_lookup(table):
+        lookup = lookup_table(digest, len(table))
+        if lookup is None:
+            return None
+        positions = table.index.get_indexer([company for company, _ in overrides]).tolist()
+        return lookup.scenario_arr(scenario_values, tuple(zip(positions, [value for _, value in overrides])))
+
+    return results_cache().get(watch_companies(path), snapshot, scenario_values, overrides, from_lookup)
+
+# The one results frame of a rerun: a row per (tracked company, scenario), company-major, so
+# wide_view() is a zero-copy companies x scenarios array for cards, metrics and charts.
+# Values stay float64; formatting is left to the element that displays them.
+def tidy_results(companies, arr_per_fte, arr):
+    n, m = arr.shape
+    return pd.DataFrame({
+        "company": pd.Categorical.from_codes(np.repeat(np.arange(n), m), categories=companies),
+        "scenario": pd.Categorical.from_codes(np.tile(np.arange(m), n), categories=SCENARIOS, ordered=True),
+        "arr_per_fte": np.ravel(arr_per_fte),
+        "arr": np.ravel(arr)
+    })
+
+
+def wide_view(results, column="arr"):
+    return results[column].to_numpy().reshape(-1, len(SCENARIOS))
+
+
+# The surface is swept at full resolution, then averaged to roughly 7px cells
+# on the rendered heatmap (coarser when the chart budget runs low) so only a
+# few thousand values reach the browser
+SURFACE_RESOLUTION = 1000
+SURFACE_CELLS = (45, 100)
+
+
+def surface_cells():
+    cells = budget_count("sensitivity_surface", 1, SURFACE_CELLS[0] * SURFACE_CELLS[1], minimum=50)
+    scale = np.sqrt(cells / (SURFACE_CELLS[0] * SURFACE_CELLS[1]))
+    return max(5, int(SURFACE_CELLS[0] * scale)), max(10, int(SURFACE_CELLS[1] * scale))
+
+
+@shared_data(max_entries=64, show_spinner="Computing sensitivity surface...")
+def surface_grid(fte, fte_change_pct, cells=SURFACE_CELLS):
+    arr_per_fte = np.linspace(50000, 300000, SURFACE_RESOLUTION)
+    fte_change = np.linspace(fte_change_pct[0], fte_change_pct[1], SURFACE_RESOLUTION) / 100
+    grid = downsample(sensitivity_surface(fte, arr_per_fte, fte_change), *cells)
+    return downsample_axis(arr_per_fte, cells[1]), downsample_axis(fte_change, cells[0]), grid
+
+
+# One store and trajectory cache per process; each rerun reads only newly appended snapshots
+# and the cache computes only the new periods of each trajectory
+@st.cache_resource
+def open_history(path):
+    return HeadcountHistory(path), TrajectoryCache(), threading.Lock()
+
+
+# One connection per process; the store serializes access and re-reads only after writes
+@st.cache_resource
+def open_scenarios(path):
+    return ScenarioStore(path)
+
+
+# One pool per process shared by every session, so report rendering never runs on a script thread
+@st.cache_resource
+def report_workers():
+    return report_pool()
+
+
+def slider_key(company):
+    return "".join(ch if ch.isalnum() else "_" for ch in company.lower()) + "_slider"
+
+
+def remember_override(company):
+    st.session_state.custom_overrides[company] = st.session_state[slider_key(company)]
+
+
+# (min, max) of each scenario slider and of the custom sliders, all in SLIDER_STEP steps
+SCENARIO_BOUNDS = {"bear": (50000, 200000), "base": (100000, 250000), "bull": (150000, 300000)}
+CUSTOM_BOUNDS = (50000, 300000)
+SLIDER_STEP = 10000
+CALIBRATION_RESAMPLES = 10_000
+CALIBRATION_CONFIDENCE = 0.8
+
+
+def snap(value, bounds, step=SLIDER_STEP):
+    # Nearest slider step within bounds, for values that did not come from a slider
+    return int(min(max(round(value / step) * step, bounds[0]), bounds[1]))
+
+
+def seed_sliders(values):
+    for name, value in values.items():
+        st.session_state[f"{name}_slider"] = value
+
+
+def current_scenario(name):
+    state = st.session_state
+    tracked = tuple(state.get("tracked_companies") or company_names[:2])
+    overrides = state.get("custom_overrides", {})
+    return Scenario(name, state["bear_slider"], state["base_slider"], state["bull_slider"], tracked,
+                    {company: overrides[company] for company in tracked if company in overrides})
+
+
+def save_scenario():
+    name = st.session_state.scenario_name.strip()
+    if name:
+        open_scenarios(str(store_path())).save(current_scenario(name))
+
+
+def load_scenario():
+    scenario = open_scenarios(str(store_path())).load(st.session_state.saved_scenario)
+    seed_sliders({name: snap(getattr(scenario, name), bounds) for name, bounds in SCENARIO_BOUNDS.items()})
+    # Companies no longer in the file are dropped
+    previous = st.session_state.get("tracked_companies") or []
+    st.session_state.tracked_companies = [company for company in scenario.tracked if company in company_table.index]
+    st.session_state.custom_overrides = {company: snap(value, CUSTOM_BOUNDS) for company, value in scenario.custom.items()}
+    # Custom sliders reseed from the loaded overrides on the next run
+    for company in set(previous) | set(scenario.tracked):
+        st.session_state.pop(slider_key(company), None)
+
+
+def export_reports():
+    state = st.session_state
+    values = (state["bear_slider"], state["base_slider"], state["bull_slider"])
+    overrides = state.get("custom_overrides", {})
+    fmt = state.report_format.lower()
+    directory = reports_dir() / datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    if state.report_scope == "All companies":
+        jobs = company_jobs(company_table, values, directory, fmt, overrides)
+    else:
+        selected = list(state.get("tracked_companies") or company_names[:2])
+        table = company_table.loc[selected]
+        combined = ReportJob("Tracked companies", tuple(selected), tuple(table["fte"]), tuple(table["color"]), values,
+                             tuple(overrides.get(company, values[1]) for company in selected), str(directory / f"tracked.{fmt}"), fmt)
+        jobs = [combined] + company_jobs(table, values, directory, fmt, overrides)
+    pool = report_workers()
+    state.report_batch = (directory, [pool.submit(render, job) for job in jobs])
+
+
+def report_status():
+    directory, futures = st.session_state.report_batch
+    done = sum(future.done() for future in futures)
+    if done < len(futures):
+        st.progress(done / len(futures), text=f"Rendered {done:,} of {len(futures):,} reports")
+        return
+    if st.session_state.get("report_polling"):
+        # Finished: a full rerun drops the polling timer
+        st.session_state.report_polling = False
+        st.rerun()
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        st.error(f"{len(errors):,} of {len(futures):,} reports failed: {errors[0]}")
+    if not directory.exists():
+        # Every job failed before writing anything
+        return
+    archive = directory.with_suffix(".zip")
+    if not archive.exists():
+        shutil.make_archive(str(directory), "zip", directory)
+    st.caption(f"{len(futures) - len(errors):,} reports in `{directory}`")
+    # Read only when clicked; this runs on every full rerun while the batch is kept
+    st.download_button("Download reports (.zip)", archive.read_bytes, archive.name, "application/zip", width="stretch")
+
+
+# Company data with bright colors that work in both themes
+profiling.mark("load")
+data_path = companies_path()
+# One consistent (version, table, digest) snapshot for the whole run
+data_snapshot = watch_companies(str(data_path)).current
+data_version, company_table, _ = data_snapshot
+st.session_state.data_version = data_version
+st.session_state.data_error = watch_companies(str(data_path)).error
+if st.session_state.data_error:
+    st.warning(f"`{data_path.name}` changed but could not be read ({st.session_state.data_error}); showing the last version that could.")
+company_names = company_table.index.tolist()
+
 # Sidebar for controls
+profiling.mark("sidebar")
 with st.sidebar:
     st.markdown(f'<h2 style="color: {primary_color}; text-align: center; padding-bottom: 0.5rem;">Control Panel</h2>', unsafe_allow_html=True)
 
-    # Company data with bright colors that work in both themes
-    companies = {
-        "Collibra": {"fte": 974, "color": collibra_color},
-        "Alation": {"fte": 612, "color": alation_color}
-    }
+    # Point scenarios, or distributions parametrized by the same three sliders
+    model_mode = st.radio("Estimation Model", ["Scenarios", "Monte Carlo"], horizontal=True, key="model_mode")
 
     # Default ARR per FTE scenarios
     default_scenarios = {
@@ -182,30 +358,91 @@ with st.sidebar:
         "base": 150000,   # $150K per FTE in base case
         "bull": 250000    # $250K per FTE in bull case
     }
+    
+    # With a comparables file, the pooled fit and its P10/P90 bootstrap interval replace them
+    comparables_file = comparables_path()
+    if comparables_file.exists():
+        calibration = calibration_fit(str(comparables_file), file_digest(comparables_file), CALIBRATION_RESAMPLES, CALIBRATION_CONFIDENCE)
+        default_scenarios = seed_scenarios(calibration.loc[POOLED], SCENARIO_BOUNDS)
+        with st.expander("Calibration", expanded=False):
+            segment = st.selectbox("Fit on segment", calibration.index, index=len(calibration) - 1, key="calibration_segment")
+            fit_rows = (calibration[["companies"]].assign(
+                **{column: calibration[column].map(lambda value: f"${value/1000:,.0f}K") for column in ("low", "arr_per_fte", "high", "company_low", "company_high")}
+            ).rename(columns={"companies": "n", "low": "Fit P10", "arr_per_fte": "Fit", "high": "Fit P90",
+                              "company_low": "Company P10", "company_high": "Company P90"}))
+            st.dataframe(fit_rows, width="stretch")
+            st.caption(f"Least squares through the origin on `{comparables_file.name}`; {CALIBRATION_CONFIDENCE:.0%} fit intervals from up to {CALIBRATION_RESAMPLES:,} bootstrap resamples. Bear and bull seed from the company P10/P90.")
+            st.button(f"Seed scenarios from {segment}", on_click=seed_sliders, args=(seed_scenarios(calibration.loc[segment], SCENARIO_BOUNDS),),
+                      width="stretch")
 
+    # Seeded through session state so the calibration button can move them later
+    for name, value in default_scenarios.items():
+        st.session_state.setdefault(f"{name}_slider", value)
+    
     # Create scenario sliders with bright, visible colors
     st.markdown(f'<h3 style="color: {primary_color}; font-size: 1.2rem; margin-bottom: 1rem;">ARR per FTE Scenarios</h3>', unsafe_allow_html=True)
     
     st.markdown('<p class="scenario-label" style="color: #F87171;">Bear Case (Conservative)</p>', unsafe_allow_html=True)
-    bear_case = st.slider("Bear Case ARR per FTE", 50000, 200000, default_scenarios["bear"], step=10000, format="$%d", key="bear_slider", label_visibility="collapsed")
+    bear_case = st.slider("Bear Case ARR per FTE", *SCENARIO_BOUNDS["bear"], step=SLIDER_STEP, format="$%d", key="bear_slider", label_visibility="collapsed")
     
     st.markdown('<p class="scenario-label" style="color: #4ADE80;">Base Case (Expected)</p>', unsafe_allow_html=True)
-    base_case = st.slider("Base Case ARR per FTE", 100000, 250000, default_scenarios["base"], step=10000, format="$%d", key="base_slider", label_visibility="collapsed")
+    base_case = st.slider("Base Case ARR per FTE", *SCENARIO_BOUNDS["base"], step=SLIDER_STEP, format="$%d", key="base_slider", label_visibility="collapsed")
     
     st.markdown('<p class="scenario-label" style="color: #60A5FA;">Bull Case (Optimistic)</p>', unsafe_allow_html=True)
-    bull_case = st.slider("Bull Case ARR per FTE", 150000, 300000, default_scenarios["bull"], step=10000, format="$%d", key="bull_slider", label_visibility="collapsed")
+    bull_case = st.slider("Bull Case ARR per FTE", *SCENARIO_BOUNDS["bull"], step=SLIDER_STEP, format="$%d", key="bull_slider", label_visibility="collapsed")
+    
+    if model_mode == "Monte Carlo":
+        st.markdown(f'<h3 style="color: {primary_color}; font-size: 1.2rem; margin-bottom: 1rem;">Monte Carlo Settings</h3>', unsafe_allow_html=True)
+        mc_distribution = st.selectbox("ARR per FTE distribution", DISTRIBUTIONS, key="mc_distribution",
+                                       help="Triangular: bear/base/bull as min/mode/max. Lognormal: bear/bull as P10/P90 around a base median. Uniform: bear to bull.")
+        mc_fte_spread = st.slider("FTE uncertainty (std. dev.)", 0, 30, 0, step=1, format="%d%%", key="mc_fte_spread") / 100
+        mc_draws = st.select_slider("Draws", [100_000, 250_000, 500_000, 1_000_000, 2_000_000, 5_000_000], 1_000_000,
+                                    format_func=lambda n: f"{n:,}", key="mc_draws")
+        mc_seed = st.number_input("Random seed", 0, 2**32 - 1, 42, step=1, key="mc_seed")
+    
+    # Forward projection: headcount growth and ARR per FTE drift compound quarterly
+    projection_mode = st.toggle("Forward projection", key="projection_mode")
+    if projection_mode:
+        projection_quarters = st.slider("Horizon (quarters)", 4, 40, 20, step=1, key="projection_quarters")
+        projection_growth = st.slider("Headcount growth (annual)", -30, 100, 10, step=1, format="%d%%", key="projection_growth",
+                                      help="Used for companies without an fte_growth value in the company file.") / 100
+        projection_drift = st.slider("ARR per FTE drift (annual)", -20, 30, 3, step=1, format="%d%%", key="projection_drift") / 100
     
     # Add some visual separation
     st.markdown("<hr>", unsafe_allow_html=True)
     
-    # Custom ARR per FTE for individual company tuning
-    st.markdown('<h3 style="color: #4F46E5; font-size: 1.2rem; margin-bottom: 1rem;">Company-Specific Tuning</h3>', unsafe_allow_html=True)
-    
-    st.markdown(f'<p class="scenario-label" style="color: {collibra_color};">Collibra Custom ARR per FTE</p>', unsafe_allow_html=True)
-    custom_collibra = st.slider("Collibra Custom ARR per FTE", 50000, 300000, base_case, step=10000, format="$%d", key="collibra_slider", label_visibility="collapsed")
-    
-    st.markdown(f'<p class="scenario-label" style="color: {alation_color};">Alation Custom ARR per FTE</p>', unsafe_allow_html=True)
-    custom_alation = st.slider("Alation Custom ARR per FTE", 50000, 300000, base_case, step=10000, format="$%d", key="alation_slider", label_visibility="collapsed")
+    # Only tracked companies get cards, custom sliders and charts; the rest use the base case
+    st.markdown('<h3 style="color: #4F46E5; font-size: 1.2rem; margin-bottom: 1rem;">Tracked Companies</h3>', unsafe_allow_html=True)
+    tracked = st.multiselect("Tracked companies", company_names, default=company_names[:2], key="tracked_companies", label_visibility="collapsed")
+    if not tracked:
+        tracked = company_names[:2]
+    
+    # Named scenarios persist slider values, tracked companies and overrides across sessions
+    with st.expander("Saved Scenarios", expanded=False):
+        st.text_input("Scenario name", key="scenario_name")
+        st.button("Save current settings", on_click=save_scenario, width="stretch")
+        saved_names = open_scenarios(str(store_path())).names()
+        if saved_names:
+            st.selectbox("Saved scenario", saved_names, key="saved_scenario")
+            st.button("Load scenario", on_click=load_scenario, width="stretch")
+    
+    # Static PDF/PNG reports, rendered in worker processes while the page stays responsive
+    with st.expander("Export Reports", expanded=False):
+        st.radio("Reports for", ["Tracked companies", "All companies"], key="report_scope",
+                 help="Tracked: one combined report plus one per tracked company. All: one report per company in the file.")
+        st.radio("Format", ["PDF", "PNG"], horizontal=True, key="report_format")
+        st.button("Render reports", on_click=export_reports, width="stretch")
+        if "report_batch" in st.session_state:
+            pending = not all(future.done() for future in st.session_state.report_batch[1])
+            st.session_state.report_polling = pending
+            # Only a running batch polls; the timer reruns just the status fragment
+            st.fragment(report_status, run_every=1 if pending else None)()
+
+profiling.mark("results")
+# Custom ARR per FTE overrides outlive their sliders, which only render with the Summary tab.
+# Companies without an explicit override follow the base case.
+custom_overrides = st.session_state.setdefault("custom_overrides", {})
+custom_values = {company: custom_overrides.get(company, base_case) for company in tracked}
 
 # Calculate ARR for each scenario
 scenarios = {
@@ -214,169 +451,199 @@ scenarios = {
     "Bull": {"value": bull_case, "color": bull_color}
 }
 
-results = {}
+fte = company_table["fte"].to_numpy()
+tracked_positions = company_table.index.get_indexer(tracked)
+tracked_custom = [custom_values[company] for company in tracked]
+overrides = tuple(zip(tracked, tracked_custom))
+df_results = scenario_results(str(data_path), data_snapshot, tuple(data["value"] for data in scenarios.values()), overrides)
+results = tidy_results(tracked, scenario_matrix([bear_case, base_case, bull_case], tracked_custom, base_case),
+                       df_results.iloc[:, tracked_positions].to_numpy().T)
+tracked_table = company_table.loc[tracked]
+companies = {company: {"fte": row.fte, "color": row.color} for company, row in tracked_table.iterrows()}
 
-for company, data in companies.items():
-    results[company] = {
-        scenario: data["fte"] * scenarios[scenario]["value"] for scenario in scenarios
-    }
-    # Add custom scenario
-    if company == "Collibra":
-        results[company]["Custom"] = data["fte"] * custom_collibra
-    else:
-        results[company]["Custom"] = data["fte"] * custom_alation
+# Bear/base/bull fans for the tracked companies, sliced from the whole-universe cube
+if projection_mode:
+    profiling.mark("projection")
+    custom_all = np.full(len(company_table), np.nan)
+    custom_all[tracked_positions] = tracked_custom
+    cube = projection_cube(
+        company_table["fte"].to_numpy(), company_table["fte_growth"].fillna(projection_growth).to_numpy(),
+        scenario_matrix([bear_case, base_case, bull_case], custom_all, base_case), projection_drift, projection_quarters
+    )
+    # (quarters + 1, tracked, bear/base/bull) in $M
+    projection_m = cube[tracked_positions, :, :3].transpose(1, 0, 2) / 1000000
+    projection_dates = tuple(pd.date_range(pd.Timestamp.today().normalize(), periods=projection_quarters + 1, freq=pd.DateOffset(months=3)).strftime("%Y-%m-%d"))
 
-# Convert results to DataFrame for easier visualization
-df_results = pd.DataFrame(results)
+# P10/P50/P90 bands: every company scales the same simulated ARR-per-FTE distribution
+if model_mode == "Monte Carlo":
+    profiling.mark("monte_carlo")
+    mc_dist = simulate_arr_per_fte(mc_distribution, bear_case, base_case, bull_case, mc_fte_spread, mc_draws, int(mc_seed))
+    mc_quantiles = quantiles(mc_dist, [0.1, 0.5, 0.9])
+    mc_bands = company_bands(tracked_table["fte"].to_numpy(), mc_dist)
 
 # Determine current theme colors for in-code styling
 if st.get_option("theme.base") == "dark":
-    card_text_color = text_color_light
-    card_value_bg = dark_card_background
+    card_theme = "dark"
     chart_bg = dark_card_background
     axis_text_color = text_color_light
 else:
-    card_text_color = text_color_dark
-    card_value_bg = card_background
+    card_theme = "light"
     chart_bg = card_background
     axis_text_color = text_color_dark
 
-# Create tabs for organization
-tab_summary, tab_detailed, tab_sensitivity = st.tabs(["📊 Summary Dashboard", "🔍 Detailed Analysis", "📈 Sensitivity Analysis"])
+chart_theme = (chart_bg, axis_text_color)
+scenario_colors = (bear_color, base_color, bull_color)
+tracked_colors = tuple(tracked_table["color"])
 
-with tab_summary:
-    # Company metrics in the top row
-    st.markdown('<h2 class="section-header">Company Information</h2>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown(f"""
-        <div class="company-card" style="border-left: 4px solid {collibra_color}">
-            <h3 style="color: {collibra_color}; margin-top: 0;">Collibra</h3>
-            <p style="color: {card_text_color};"><b>FTE Count:</b> {companies['Collibra']['fte']:,}</p>
-            <div style="display: flex; justify-content: space-between; margin-top: 1rem;">
-                <div style="text-align: center; padding: 0.5rem; background-color: {card_value_bg}; border-radius: 0.25rem; width: 30%;">
-                    <div style="color: {bear_color}; font-weight: bold;">Bear</div>
-                    <div style="color: {card_text_color};">${results['Collibra']['Bear']/1000000:.1f}M</div>
-                </div>
-                <div style="text-align: center; padding: 0.5rem; background-color: {card_value_bg}; border-radius: 0.25rem; width: 30%;">
-                    <div style="color: {base_color}; font-weight: bold;">Base</div>
-                    <div style="color: {card_text_color};">${results['Collibra']['Base']/1000000:.1f}M</div>
-                </div>
-                <div style="text-align: center; padding: 0.5rem; background-color: {card_value_bg}; border-radius: 0.25rem; width: 30%;">
-                    <div style="color: {bull_color}; font-weight: bold;">Bull</div>
-                    <div style="color: {card_text_color};">${results['Collibra']['Bull']/1000000:.1f}M</div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="company-card" style="border-left: 4px solid {alation_color}">
-            <h3 style="color: {alation_color}; margin-top: 0;">Alation</h3>
-            <p style="color: {card_text_color};"><b>FTE Count:</b> {companies['Alation']['fte']:,}</p>
-            <div style="display: flex; justify-content: space-between; margin-top: 1rem;">
-                <div style="text-align: center; padding: 0.5rem; background-color: {card_value_bg}; border-radius: 0.25rem; width: 30%;">
-                    <div style="color: {bear_color}; font-weight: bold;">Bear</div>
-                    <div style="color: {card_text_color};">${results['Alation']['Bear']/1000000:.1f}M</div>
-                </div>
-                <div style="text-align: center; padding: 0.5rem; background-color: {card_value_bg}; border-radius: 0.25rem; width: 30%;">
-                    <div style="color: {base_color}; font-weight: bold;">Base</div>
-                    <div style="color: {card_text_color};">${results['Alation']['Base']/1000000:.1f}M</div>
-                </div>
-                <div style="text-align: center; padding: 0.5rem; background-color: {card_value_bg}; border-radius: 0.25rem; width: 30%;">
-                    <div style="color: {bull_color}; font-weight: bold;">Bull</div>
-                    <div style="color: {card_text_color};">${results['Alation']['Bull']/1000000:.1f}M</div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+
+# Card chrome and theme colors live in the stylesheet; each card only carries its name,
+# color and numbers. The grid for one page is a single markdown element.
+CARDS_PER_PAGE = 12
+TUNING_PER_PAGE = 12
+CARD_TEMPLATE = (
+    '<div class="company-card" style="--company-color: {color}">'
+    '<span class="card-title">{name}</span>'
+    '<p><b>FTE Count:</b> {fte:,.0f}</p>'
+    '<div class="scenario-values">'
+    '<span class="bear"><b>Bear</b>${bear:.1f}M</span>'
+    '<span class="base"><b>Base</b>${base:.1f}M</span>'
+    '<span class="bull"><b>Bull</b>${bull:.1f}M</span>'
+    '</div></div>'
+)
+
+
+def card_grid_html(names, ftes, colors, arr_m):
+    cards = "".join(
+        CARD_TEMPLATE.format(name=escape(name), color=escape(color), fte=fte, bear=bear, base=base, bull=bull)
+        for name, fte, color, (bear, base, bull) in zip(names, ftes, colors, arr_m.tolist())
+    )
+    return f'<div class="card-grid {card_theme}">{cards}</div>'
+
+
+def page_slice(count, per_page, key):
+    # Page controls over count tracked companies; returns the visible slice
+    pages = -(-count // per_page)
+    page = 1
+    if pages > 1:
+        if st.session_state.get(key, 1) > pages:
+            st.session_state[key] = pages
+        info_col, page_col = st.columns([3, 1])
+        with page_col:
+            page = st.number_input("Page", 1, pages, step=1, key=key)
+        with info_col:
+            first = (page - 1) * per_page
+            st.caption(f"Page {page} of {pages}: showing {first + 1}–{min(first + per_page, count)} of {count} tracked companies")
+    return slice((page - 1) * per_page, page * per_page)
+
+
+@st.fragment
+@profiling.timed("cards")
+def company_cards(names, ftes, colors, arr_m):
+    # Only the visible page is rendered; paging reruns just this fragment
+    visible = page_slice(len(names), CARDS_PER_PAGE, "card_page")
+    st.markdown(card_grid_html(names[visible], ftes[visible], colors[visible], arr_m[visible]), unsafe_allow_html=True)
+
+
+def column_rows(items, per_row):
+    # Yield (column, item) pairs, starting a new row of columns every per_row items
+    for start in range(0, len(items), per_row):
+        for col, item in zip(st.columns(per_row), items[start:start + per_row]):
+            yield col, item
+
+
+@st.fragment
+@profiling.timed("tuning")
+@payload.scoped
+def company_tuning(results):
+    # Custom sliders and everything that reads them; moving one reruns only this fragment
+    st.markdown('<h2 class="section-header">Company-Specific Tuning</h2>', unsafe_allow_html=True)
+    
+    # A fragment rerun keeps the arguments of the last full run, so overrides are read
+    # from session state here rather than passed in
+    overrides = st.session_state.custom_overrides
+    custom_values = {company: overrides.get(company, base_case) for company in tracked}
+    # Sliders and metrics are paged like the cards; the chart still shows every tracked company
+    visible = page_slice(len(tracked), TUNING_PER_PAGE, "tuning_page")
+    for col, company in column_rows(tracked[visible], 4):
+        with col:
+            st.markdown(f'<p class="scenario-label" style="color: {escape(companies[company]["color"])};">{escape(company)} Custom ARR per FTE</p>', unsafe_allow_html=True)
+            # Untouched sliders track the base case; a moved one keeps its own value
+            if company not in overrides or slider_key(company) not in st.session_state:
+                st.session_state[slider_key(company)] = overrides.get(company, base_case)
+            custom_values[company] = st.slider(f"{company} Custom ARR per FTE", *CUSTOM_BOUNDS, step=SLIDER_STEP, format="$%d",
+                                               key=slider_key(company), label_visibility="collapsed", on_change=remember_override, args=(company,))
+    
+    arr_m = wide_view(results) / 1000000
+    custom_arr_per_fte = scenario_matrix([bear_case, base_case, bull_case], [custom_values[company] for company in tracked], base_case)
+    arr_m[:, -1] = compute_arr(tracked_table["fte"].to_numpy(), custom_arr_per_fte)[:, -1] / 1000000
     
     # Summary metrics
     st.markdown('<h2 class="section-header">ARR Summary</h2>', unsafe_allow_html=True)
     
-    collibra_diff = (results["Collibra"]["Bull"] - results["Collibra"]["Bear"]) / 1000000
-    alation_diff = (results["Alation"]["Bull"] - results["Alation"]["Bear"]) / 1000000
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    custom_diff = {
-        "Collibra": (results["Collibra"]["Custom"] - results["Collibra"]["Base"]) / 1000000,
-        "Alation": (results["Alation"]["Custom"] - results["Alation"]["Base"]) / 1000000
-    }
-    
-    with col1:
-        st.metric(
-            "Collibra Base ARR", 
-            f"${results['Collibra']['Base']/1000000:.1f}M",
-            f"{custom_diff['Collibra']:.1f}M in Custom"
-        )
-    
-    with col2:
-        st.metric(
-            "Alation Base ARR", 
-            f"${results['Alation']['Base']/1000000:.1f}M",
-            f"{custom_diff['Alation']:.1f}M in Custom"
-        )
+    bear_m, base_m, bull_m, custom_m = arr_m[visible].T
+    summary_metrics = [
+        (f"{company} Base ARR", f"${base:.1f}M", f"{custom - base:.1f}M in Custom")
+        for company, base, custom in zip(tracked[visible], base_m, custom_m)
+    ] + [
+        (f"{company} ARR Range", f"${bull - bear:.1f}M", "Bear to Bull spread")
+        for company, bear, bull in zip(tracked[visible], bear_m, bull_m)
+    ]
     
-    with col3:
-        st.metric(
-            "Collibra ARR Range", 
-            f"${collibra_diff:.1f}M",
-            f"Bear to Bull spread"
-        )
-    
-    with col4:
-        st.metric(
-            "Alation ARR Range", 
-            f"${alation_diff:.1f}M",
-            f"Bear to Bull spread"
-        )
+    for col, (label, value, delta) in column_rows(summary_metrics, 4):
+        with col:
+            st.metric(label, value, delta)
     
     # Main chart
     st.markdown('<h2 class="section-header">Scenario Comparison</h2>', unsafe_allow_html=True)
     
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     
-    scenarios_list = ["Bear", "Base", "Bull", "Custom"]
-    companies_list = list(companies.keys())
-    
-    chart_data = []
-    for company in companies_list:
-        for scenario in scenarios_list:
-            chart_data.append({
-                "Company": company,
-                "Scenario": scenario,
-                "ARR (Millions)": results[company][scenario] / 1000000
-            })
-    
-    chart_df = pd.DataFrame(chart_data)
-    
-    chart = alt.Chart(chart_df).mark_bar().encode(
-        x=alt.X('Company:N'),
-        y=alt.Y('ARR (Millions):Q', title='ARR ($ Millions)'),
-        color=alt.Color('Scenario:N', scale=alt.Scale(
-            domain=scenarios_list,
-            range=[bear_color, base_color, bull_color, '#9CA3AF']
-        )),
-        column=alt.Column('Scenario:N'),
-        tooltip=['Company', 'Scenario', 'ARR (Millions)']
-    ).properties(width=120)
-    
-    chart = chart.configure_view(
-        strokeWidth=0,
-        fill=chart_bg
-    ).configure_axis(
-        labelColor=axis_text_color,
-        titleColor=axis_text_color
-    )
-    
-    st.altair_chart(chart, use_container_width=True)
+    comparison_spec = chart_spec("scenario_comparison", tuple(tracked), SCENARIOS, tuple(arr_m.ravel()), scenario_colors, chart_theme)
+    if projection_mode:
+        comparison_col, projection_col = st.columns([3, 2])
+        with comparison_col:
+            st.vega_lite_chart(comparison_spec, width="stretch")
+        with projection_col:
+            # Thinned to fewer quarters when the chart budget is short, always keeping the horizon
+            keep = thinned("arr_projection", len(tracked), len(projection_dates))
+            shown_m = projection_m[keep]
+            st.vega_lite_chart(chart_spec(
+                "arr_projection", tuple(np.asarray(projection_dates)[keep]), tuple(tracked), tracked_colors,
+                tuple(shown_m[:, :, 0].ravel()), tuple(shown_m[:, :, 1].ravel()), tuple(shown_m[:, :, 2].ravel()), chart_theme
+            ), width="stretch")
+            st.caption(f"{projection_quarters} quarters at {projection_growth:+.0%} headcount growth (unless set per company) and {projection_drift:+.0%} ARR per FTE drift a year.")
+    else:
+        st.vega_lite_chart(comparison_spec, width="stretch")
     st.markdown('</div>', unsafe_allow_html=True)
 
-with tab_detailed:
+
+@profiling.timed("summary")
+def summary_tab():
+    # Company metrics in the top row
+    st.markdown('<h2 class="section-header">Company Information</h2>', unsafe_allow_html=True)
+    
+    company_cards(tracked, tracked_table["fte"].to_numpy(), list(tracked_colors),
+                  wide_view(results)[:, :3] / 1000000)
+    
+    if model_mode == "Monte Carlo":
+        st.markdown('<h2 class="section-header">ARR Distribution (Monte Carlo)</h2>', unsafe_allow_html=True)
+        
+        band_col, hist_col = st.columns(2)
+        
+        with band_col:
+            st.vega_lite_chart(chart_spec("percentile_bands", tuple(tracked), tuple(mc_bands.ravel() / 1000000), tracked_colors, chart_theme), width="stretch")
+        
+        with hist_col:
+            left, right, density = coarsen(mc_dist, budget_count("arr_histograms", len(tracked), 60, minimum=10))
+            st.vega_lite_chart(chart_spec("arr_histograms", tuple(tracked), tuple(tracked_table["fte"]), tracked_colors, tuple(left), tuple(right), tuple(density), chart_theme), width="stretch")
+        
+        st.caption(f"{mc_draws:,} {mc_distribution.lower()} draws (seed {int(mc_seed)}). Mean ARR per FTE ${mc_dist.mean/1000:,.0f}K; P10/P50/P90 ${mc_quantiles[0]/1000:,.0f}K / ${mc_quantiles[1]/1000:,.0f}K / ${mc_quantiles[2]/1000:,.0f}K.")
+    
+    company_tuning(results)
+
+
+@profiling.timed("detailed")
+def detailed_tab():
     st.markdown('<h2 class="section-header">Detailed ARR Estimates</h2>', unsafe_allow_html=True)
     
     col1, col2 = st.columns([2, 3])
@@ -384,24 +651,25 @@ with tab_detailed:
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.subheader("Company Information")
+        size_reference = st.selectbox("Relative size against", tracked, key="size_reference")
+        tracked_fte = tracked_table["fte"].to_numpy()
         company_df = pd.DataFrame({
-            "Company": companies.keys(),
-            "FTE Count": [data["fte"] for data in companies.values()],
-            "Relative Size": ["100%", f"{companies['Alation']['fte']/companies['Collibra']['fte']*100:.1f}%"]
+            "Company": tracked,
+            "Segment": tracked_table["segment"].to_numpy(),
+            "FTE Count": tracked_fte,
+            "Relative Size": tracked_fte / tracked_fte[tracked.index(size_reference)] * 100
         })
         st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
-        st.dataframe(company_df, use_container_width=True, hide_index=True)
+        paged_table(company_df, "company_info", {"Relative Size": st.column_config.NumberColumn(format="%.1f%%")}, search_column="Company")
         st.markdown('</div>', unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
         
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.subheader("ARR Estimates ($ millions)")
-        display_df = (df_results / 1000000).round(1)
-        display_df_t = display_df.T
-        display_df_t.index.name = "Company"
-        display_df_t.reset_index(inplace=True)
+        arr_table = pd.DataFrame(wide_view(results) / 1000000, columns=list(SCENARIOS))
+        arr_table.insert(0, "Company", tracked)
         st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
-        st.dataframe(display_df_t, use_container_width=True, hide_index=True)
+        paged_table(arr_table, "arr_estimates", {scenario: st.column_config.NumberColumn(format="%.1f") for scenario in SCENARIOS}, search_column="Company")
         st.markdown('</div>', unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
@@ -409,60 +677,125 @@ with tab_detailed:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.subheader("ARR per FTE Comparison")
         
-        ratio_data = pd.DataFrame({
-            "Scenario": ["Bear", "Base", "Bull", "Collibra Custom", "Alation Custom"],
-            "ARR per FTE ($K)": [
-                bear_case / 1000,
-                base_case / 1000,
-                bull_case / 1000,
-                custom_collibra / 1000,
-                custom_alation / 1000
-            ]
-        })
-        
-        bar_colors = [
-            bear_color,
-            base_color, 
-            bull_color,
-            collibra_color,
-            alation_color
-        ]
-        
-        ratio_chart = alt.Chart(ratio_data).mark_bar().encode(
-            x=alt.X('Scenario:N', title='Scenario', sort=None),
-            y=alt.Y('ARR per FTE ($K):Q', title='ARR per FTE ($K)'),
-            color=alt.Color('Scenario:N', scale=alt.Scale(
-                domain=ratio_data['Scenario'].tolist(),
-                range=bar_colors
-            )),
-            tooltip=['Scenario', 'ARR per FTE ($K)']
-        ).properties(height=300)
-        
-        ratio_chart = ratio_chart.configure_view(
-            strokeWidth=0,
-            fill=chart_bg
-        ).configure_axis(
-            labelColor=axis_text_color,
-            titleColor=axis_text_color
+        ratio_spec = chart_spec(
+            "arr_per_fte_comparison",
+            ("Bear", "Base", "Bull") + tuple(f"{company} Custom" for company in tracked),
+            (bear_case / 1000, base_case / 1000, bull_case / 1000) + tuple(custom_values[company] / 1000 for company in tracked),
+            scenario_colors + tracked_colors,
+            chart_theme
         )
         
-        st.altair_chart(ratio_chart, use_container_width=True)
+        st.vega_lite_chart(ratio_spec, width="stretch")
         st.markdown('</div>', unsafe_allow_html=True)
         
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.subheader("Key Insights")
         
+        insights = []
+        if len(tracked) >= 2:
+            larger, smaller = sorted(tracked[:2], key=lambda company: companies[company]["fte"], reverse=True)
+            insights.append(f'<li><b>Employee Count Difference:</b> {escape(larger)} has {companies[larger]["fte"] - companies[smaller]["fte"]:,.0f} more employees than {escape(smaller)} ({(companies[larger]["fte"] / companies[smaller]["fte"] - 1) * 100:.1f}% larger)</li>')
+        arr_m = wide_view(results) / 1000000
+        for company, (bear, _, bull, _) in zip(tracked, arr_m):
+            insights.append(f'<li><b>{escape(company)} Range:</b> ${bear:.1f}M to ${bull:.1f}M ({bull - bear:.1f}M difference)</li>')
+        custom_summary = ", ".join(f'{escape(company)} ARR is ${custom:.1f}M' for company, custom in zip(tracked, arr_m[:, -1]))
+        insights.append(f"<li><b>Custom Scenarios:</b> With custom settings, {custom_summary}</li>")
+        
         st.markdown(f"""
         <ul>
-            <li><b>Employee Count Difference:</b> Collibra has {companies["Collibra"]["fte"] - companies["Alation"]["fte"]} more employees than Alation ({(companies["Collibra"]["fte"] / companies["Alation"]["fte"] - 1) * 100:.1f}% larger)</li>
-            <li><b>Collibra Range:</b> ${results["Collibra"]["Bear"]/1000000:.1f}M to ${results["Collibra"]["Bull"]/1000000:.1f}M ({collibra_diff:.1f}M difference)</li>
-            <li><b>Alation Range:</b> ${results["Alation"]["Bear"]/1000000:.1f}M to ${results["Alation"]["Bull"]/1000000:.1f}M ({alation_diff:.1f}M difference)</li>
-            <li><b>Custom Scenarios:</b> With custom settings, Collibra ARR is ${results["Collibra"]["Custom"]/1000000:.1f}M and Alation ARR is ${results["Alation"]["Custom"]/1000000:.1f}M</li>
+            {"".join(insights)}
         </ul>
         """, unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
+    
+    history, trajectories, history_lock = open_history(str(history_dir()))
+    with profiling.section("history"), history_lock:
+        history.refresh()
+        columns = [history.column(company) for company in tracked if company in history.companies]
+        if history.n_periods and columns:
+            history_companies = tuple(history.companies[i] for i in columns)
+            arr_per_fte = scenario_matrix([bear_case, base_case, bull_case], [custom_values[company] for company in history_companies], base_case)
+            trajectory = trajectories.get(history, columns, arr_per_fte) / 1000000
+            dates = np.datetime_as_string(history.dates)
+            # Thin older snapshots when the chart budget is short, always keeping the latest
+            keep = thinned("arr_trajectory", len(columns), history.n_periods)
+            trajectory, dates = trajectory[keep], tuple(dates[keep])
+    
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.subheader("ARR Trajectory from Headcount History")
+    if history.n_periods and columns:
+        st.vega_lite_chart(chart_spec(
+            "arr_trajectory",
+            dates, history_companies, tuple(companies[company]["color"] for company in history_companies),
+            tuple(trajectory[:, :, 0].ravel()), tuple(trajectory[:, :, 1].ravel()), tuple(trajectory[:, :, 2].ravel()), chart_theme
+        ), width="stretch")
+        st.caption(f"{history.n_periods} snapshots from {dates[0]} to {dates[-1]}"
+                   + (f" ({len(dates)} shown)" if len(dates) < history.n_periods else "") + "; shaded band spans the bear to bull case.")
+    else:
+        st.info(f"No headcount history for the tracked companies in `{history_dir()}`. Append snapshots with `python history.py ingest snapshots.csv` (columns: date, name, fte).")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    saved_scenario_comparison()
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+@profiling.timed("saved_scenarios")
+def saved_scenario_comparison():
+    # Picking a reference reruns only this fragment
+    st.subheader("Saved Scenario Comparison")
+    store = open_scenarios(str(store_path()))
+    settings, members = store.frames()
+    if settings.empty:
+        st.info("No saved scenarios yet. Save the current settings from the sidebar, or bulk-load them with `python scenario_store.py import scenarios.jsonl`.")
+        return
+    
+    reference_name = st.selectbox("Compare against", ["Current settings"] + store.names(), key="comparison_reference")
+    if reference_name == "Current settings":
+        reference = Scenario(reference_name, bear_case, base_case, bull_case, tuple(tracked), dict(custom_values))
+    else:
+        reference = store.load(reference_name)
+    
+    with profiling.section("compare"):
+        diff = compare(reference, settings, members, company_table["fte"])
+    deltas = ["bear_delta", "base_delta", "bull_delta", "custom_delta"]
+    diff[deltas] = diff[deltas] / 1000000
+    diff = diff.rename(columns={
+        "scenario": "Scenario", "saved_at": "Saved", "bear_delta": "Bear Δ ($M)", "base_delta": "Base Δ ($M)",
+        "bull_delta": "Bull Δ ($M)", "custom_delta": "Custom Δ ($M)", "added": "Companies added", "removed": "Companies removed"
+    })
+    delta_format = st.column_config.NumberColumn(format="%.1f")
+    paged_table(diff, "saved_comparison", {column: delta_format for column in diff.columns if "Δ" in column}, search_column="Scenario")
+    st.caption(f"{len(diff):,} saved scenarios evaluated on the reference's {len(reference.tracked)} companies; Δ is total ARR minus the reference's.")
+
 
-with tab_sensitivity:
+@st.fragment
+@profiling.timed("surface")
+@payload.scoped
+def sensitivity_surface_view(tracked_fte, all_fte):
+    # Surface controls rerun only this fragment
+    st.subheader("Sensitivity Surface: ARR per FTE x Headcount Change")
+    
+    scope_col, range_col = st.columns([1, 2])
+    with scope_col:
+        scope = st.radio("Companies", ["Tracked", "All"], horizontal=True, key="surface_scope",
+                         help=f"Sum ARR over the tracked companies or all {len(all_fte):,} companies in the file.")
+    with range_col:
+        fte_change_pct = st.slider("FTE change range", -50, 100, (-30, 50), step=5, format="%d%%", key="surface_fte_change")
+    
+    arr_per_fte, fte_change, grid = surface_grid(tracked_fte if scope == "Tracked" else all_fte, fte_change_pct, surface_cells())
+    surface_spec = chart_spec(
+        "sensitivity_surface",
+        tuple(arr_per_fte / 1000), tuple(fte_change * 100), tuple(grid.ravel() / 1000000),
+        (bear_case / 1000, base_case / 1000, bull_case / 1000), scenario_colors, chart_theme
+    )
+    st.vega_lite_chart(surface_spec, width="stretch")
+    st.caption(f"{SURFACE_RESOLUTION:,} x {SURFACE_RESOLUTION:,} sweep averaged to {grid.shape[0]} x {grid.shape[1]} cells. Markers show the scenarios at today's headcount.")
+
+
+@profiling.timed("sensitivity")
+def sensitivity_tab():
     st.markdown('<h2 class="section-header">Sensitivity Analysis</h2>', unsafe_allow_html=True)
     
     st.markdown("""
@@ -473,107 +806,114 @@ with tab_sensitivity:
     
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     
-    arr_per_fte_range = np.arange(50000, 300000, 10000)
-    collibra_arr = [companies["Collibra"]["fte"] * arr for arr in arr_per_fte_range]
-    alation_arr = [companies["Alation"]["fte"] * arr for arr in arr_per_fte_range]
-    
-    sensitivity_df = pd.DataFrame({
-        'ARR per FTE ($K)': arr_per_fte_range / 1000,
-        'Collibra ARR ($M)': [arr / 1000000 for arr in collibra_arr],
-        'Alation ARR ($M)': [arr / 1000000 for arr in alation_arr]
-    })
-    
-    sensitivity_melted = pd.melt(
-        sensitivity_df, 
-        id_vars=['ARR per FTE ($K)'], 
-        value_vars=['Collibra ARR ($M)', 'Alation ARR ($M)'],
-        var_name='Company', 
-        value_name='ARR ($M)'
+    arr_per_fte_range = np.arange(*SENSITIVITY_RANGE)
+    steps = budget_count("sensitivity", len(tracked), len(arr_per_fte_range))
+    if steps < len(arr_per_fte_range):
+        arr_per_fte_range = np.linspace(arr_per_fte_range[0], arr_per_fte_range[-1], steps)
+    sensitivity_spec = chart_spec(
+        "sensitivity",
+        tuple(tracked), tuple(tracked_table["fte"]), tracked_colors, tuple(arr_per_fte_range / 1000),
+        (bear_case / 1000, base_case / 1000, bull_case / 1000), scenario_colors, chart_theme,
+        tuple(mc_quantiles / 1000) if model_mode == "Monte Carlo" else None
     )
     
-    line_chart = alt.Chart(sensitivity_melted).mark_line(
-        strokeWidth=3
-    ).encode(
-        x=alt.X('ARR per FTE ($K):Q', title='ARR per FTE ($K)'),
-        y=alt.Y('ARR ($M):Q', title='ARR ($ Millions)'),
-        color=alt.Color('Company:N', scale=alt.Scale(
-            domain=['Collibra ARR ($M)', 'Alation ARR ($M)'],
-            range=[collibra_color, alation_color]
-        )),
-        tooltip=['Company', 'ARR per FTE ($K)', 'ARR ($M)']
-    ).properties(
-        height=500
-    )
+    st.vega_lite_chart(sensitivity_spec, width="stretch")
+    st.markdown('</div>', unsafe_allow_html=True)
     
-    bear_line = alt.Chart(pd.DataFrame({'x': [bear_case / 1000]})).mark_rule(
-        color=bear_color, strokeDash=[5, 5], strokeWidth=2
-    ).encode(x='x:Q')
-    
-    base_line = alt.Chart(pd.DataFrame({'x': [base_case / 1000]})).mark_rule(
-        color=base_color, strokeDash=[5, 5], strokeWidth=2
-    ).encode(x='x:Q')
-    
-    bull_line = alt.Chart(pd.DataFrame({'x': [bull_case / 1000]})).mark_rule(
-        color=bull_color, strokeDash=[5, 5], strokeWidth=2
-    ).encode(x='x:Q')
-    
-    bear_text = alt.Chart(pd.DataFrame({'x': [bear_case / 1000], 'y': [sensitivity_df['Collibra ARR ($M)'].max() * 0.9]})).mark_text(
-        align='left', baseline='middle', dx=5, color=bear_color, fontWeight='bold'
-    ).encode(x='x:Q', y='y:Q', text=alt.value('Bear Case'))
-    
-    base_text = alt.Chart(pd.DataFrame({'x': [base_case / 1000], 'y': [sensitivity_df['Collibra ARR ($M)'].max() * 0.95]})).mark_text(
-        align='left', baseline='middle', dx=5, color=base_color, fontWeight='bold'
-    ).encode(x='x:Q', y='y:Q', text=alt.value('Base Case'))
-    
-    bull_text = alt.Chart(pd.DataFrame({'x': [bull_case / 1000], 'y': [sensitivity_df['Collibra ARR ($M)'].max()]})).mark_text(
-        align='left', baseline='middle', dx=5, color=bull_color, fontWeight='bold'
-    ).encode(x='x:Q', y='y:Q', text=alt.value('Bull Case'))
-    
-    final_chart = line_chart + bear_line + base_line + bull_line + bear_text + base_text + bull_text
-    final_chart = final_chart.configure_view(
-        strokeWidth=0,
-        fill=chart_bg
-    ).configure_axis(
-        labelColor=axis_text_color,
-        titleColor=axis_text_color
-    )
+    if model_mode == "Monte Carlo":
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.subheader("Simulated ARR per FTE Distribution")
+        left, right, density = coarsen(mc_dist, budget_count("arr_per_fte_histogram", 1, 80, minimum=10))
+        st.vega_lite_chart(chart_spec("arr_per_fte_histogram", tuple(left / 1000), tuple(right / 1000), tuple(density), tuple(mc_quantiles / 1000), primary_color, chart_theme), width="stretch")
+        st.markdown('</div>', unsafe_allow_html=True)
     
-    st.altair_chart(final_chart, use_container_width=True)
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    sensitivity_surface_view(tracked_table["fte"].to_numpy(), fte)
     st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.subheader("Sensitivity Table: ARR ($ millions) at Selected ARR per FTE Values")
     
-    key_values = [100, 125, 150, 175, 200, 225, 250]
-    sens_table_data = []
+    # One row per company and one column per ARR per FTE value, optionally as differences from a reference company
+    difference_from = st.selectbox("Show as difference from", ["(none)"] + list(tracked), key="sensitivity_reference")
+    key_arr_m = compute_arr(tracked_table["fte"].to_numpy(), KEY_VALUES) / 1000000
+    if difference_from != "(none)":
+        key_arr_m = key_arr_m - key_arr_m[tracked.index(difference_from)]
+    value_columns = [f"${value // 1000}K" for value in KEY_VALUES]
+    sens_table = pd.DataFrame(key_arr_m, columns=value_columns)
+    sens_table.insert(0, "Company", tracked)
     
-    for val in key_values:
-        val_k = val * 1000
-        sens_table_data.append({
-            "ARR per FTE": f"${val}K",
-            "Collibra ARR": f"${companies['Collibra']['fte'] * val_k / 1000000:.1f}M",
-            "Alation ARR": f"${companies['Alation']['fte'] * val_k / 1000000:.1f}M",
-            "Difference": f"${(companies['Collibra']['fte'] - companies['Alation']['fte']) * val_k / 1000000:.1f}M"
-        })
-    
-    sens_table = pd.DataFrame(sens_table_data)
     st.markdown('<div class="dataframe-container">', unsafe_allow_html=True)
-    st.dataframe(sens_table, use_container_width=True, hide_index=True)
+    money = st.column_config.NumberColumn(format="$%.1fM")
+    paged_table(sens_table, "sensitivity_table", {column: money for column in value_columns}, search_column="Company")
     st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+
+profiling.mark("tabs")
+# Create tabs for organization; only the selected tab's body runs on each rerun
+tab_summary, tab_detailed, tab_sensitivity = st.tabs(["📊 Summary Dashboard", "🔍 Detailed Analysis", "📈 Sensitivity Analysis"], key="active_tab", on_change="rerun")
+
+if tab_summary.open:
+    with tab_summary:
+        summary_tab()
+
+if tab_detailed.open:
+    with tab_detailed:
+        detailed_tab()
+
+if tab_sensitivity.open:
+    with tab_sensitivity:
+        sensitivity_tab()
+
 # Footer with instructions
+profiling.mark("footer")
+fte_note = ", ".join(f"{company}: {companies[company]['fte']:,.0f}" for company in tracked)
 st.markdown('<div class="footer">', unsafe_allow_html=True)
-st.markdown("""
+st.markdown(f"""
 ### How to Use This Tool:
 
 1. Use the sliders in the sidebar to adjust the ARR per FTE values for different scenarios  
-2. Fine-tune company-specific ARR per FTE values using the "Company-Specific Tuning" sliders  
+2. Pick the companies to track in the sidebar and fine-tune their ARR per FTE values in the "Company-Specific Tuning" section of the Summary Dashboard  
 3. Navigate between tabs to view different analyses:
    - **Summary Dashboard:** Quick overview of ARR estimates  
    - **Detailed Analysis:** In-depth data tables and charts  
    - **Sensitivity Analysis:** Examine how ARR changes with different ARR per FTE values
 
-*Note: All calculations are based on the provided FTE counts (Collibra: 974, Alation: 612) and the ARR per FTE ratios.*
+*Note: All calculations are based on the FTE counts in `{data_path.name}` ({fte_note}) and the ARR per FTE ratios.*
 """)
 st.markdown('</div>', unsafe_allow_html=True)
+
+
+# Pushes a rewritten company file to open sessions: the poll itself renders nothing and only
+# a newer table (or a new read error) triggers a full rerun, which reuses every cache the change did not touch
+@st.fragment(run_every=DATA_POLL_SECONDS)
+def data_refresh():
+    watched = watch_companies(str(data_path))
+    if watched.version != st.session_state.data_version or watched.error != st.session_state.data_error:
+        st.rerun()
+
+
+data_refresh()
+
+# Debug panel: breakdown of this run and a rolling history (fragment reruns included)
+run_profile = profiling.finish(caches=shared_cache.STATS.snapshot(), charts=payload.finish())
+if run_profile:
+    with st.expander("⏱️ Rerun profile", expanded=False):
+        st.caption(f"{run_profile['ms']:,.1f} ms and {run_profile['bytes']/1024:,.1f} KB sent this run. Section times exclude nested sections.")
+        chart_budget = run_profile["charts"]
+        st.caption(f"Chart data: {chart_budget['used']/1024:,.1f} of {chart_budget['limit']/1024:,.0f} KB budget"
+                   + (f"; aggregated {', '.join(chart_budget['aggregated'])}" if chart_budget["aggregated"] else ""))
+        sections = pd.DataFrame(run_profile["sections"]).sort_values("ms", ascending=False)
+        st.dataframe(sections, width="stretch", hide_index=True)
+        recent = pd.DataFrame([
+            {"Run": profile["run"], "ms": profile["ms"], "KB": round(profile["bytes"] / 1024, 1),
+             "Slowest section": max(profile["sections"], key=lambda row: row["ms"])["section"],
+             "Largest payload": next(iter(profile["payload"]), "")}
+            for profile in reversed(profiling.history())
+        ])
+        st.dataframe(recent, width="stretch", hide_index=True)
+        st.caption("Process-wide caches, shared by every session")
+        cache_rows = pd.DataFrame(run_profile["caches"])
+        cache_rows["data KB"] = (cache_rows["cache"].map(shared_cache.memory_by_cache()) / 1024).round(1)
+        st.dataframe(cache_rows, width="stretch", hide_index=True)
@@ -0,0 +1,232 @@
+"""Local HTTP/JSON API serving the dashboard's ARR numbers.
+
+Standard library only (no Streamlit). Every endpoint is a GET whose query
+string is parsed and normalized (defaults filled in, numbers canonicalized,
+duplicates dropped), so equivalent URLs share one entry in an LRU cache of
+encoded responses. The cache is keyed on the company file digest too, so
+editing the file invalidates it. Requests are handled on threads over
+keep-alive HTTP/1.1 connections.
+
+    GET /companies
+    GET /arr?company=Collibra&company=Alation&bear=90000&base=150000&bull=250000&custom=Collibra=200000
+    GET /sensitivity?company=Collibra&start=50000&stop=300000&step=10000
+    GET /key-values?company=Collibra&company=Alation
+    GET /stats
+
+``company`` is repeatable and defaults to every company in the file.
+
+    python api.py --port 8600
+"""
+import argparse
+import json
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from companies import companies_path, file_digest, read_companies
+from engine import KEY_VALUES, SCENARIOS, SENSITIVITY_RANGE, compute_arr, scenario_matrix
+
+DEFAULT_SCENARIOS = {"bear": 90000.0, "base": 150000.0, "bull": 250000.0}
+# Sweep points x companies in one /sensitivity response
+MAX_SWEEP_VALUES = 1_000_000
+
+
+class NotFound(ValueError):
+    pass
+
+
+class CompanyFileError(RuntimeError):
+    """The company file is missing or does not parse; a server-side problem, not the request's."""
+
+
+@lru_cache(maxsize=4)
+def load_table(path, digest):
+    return read_companies(path)
+
+
+def _number(params, name, default):
+    values = params.get(name)
+    if not values:
+        return float(default)
+    try:
+        value = float(values[-1])
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {values[-1]!r}") from None
+    if not np.isfinite(value):
+        raise ValueError(f"{name} must be finite")
+    return value
+
+
+def _companies(params):
+    # Order is kept (it sets the key-values difference); repeats are dropped
+    return tuple(dict.fromkeys(params.get("company", ())))
+
+
+def normalize(endpoint, query):
+    """Return the canonical, hashable form of a request's parameters."""
+    params = parse_qs(query, keep_blank_values=False)
+    if endpoint == "/companies":
+        return ()
+    if endpoint == "/arr":
+        custom = {}
+        for value in params.get("custom", ()):
+            company, _, arr = value.rpartition("=")
+            if not company:
+                raise ValueError(f"custom must be COMPANY=ARR_PER_FTE, got {value!r}")
+            custom[company] = _number({"custom": [arr]}, "custom", 0)
+        scenario_values = tuple(_number(params, name, default) for name, default in DEFAULT_SCENARIOS.items())
+        return (_companies(params), scenario_values, tuple(sorted(custom.items())))
+    if endpoint == "/sensitivity":
+        start, stop, step = (_number(params, name, default) for name, default in zip(("start", "stop", "step"), SENSITIVITY_RANGE))
+        if step <= 0 or stop <= start:
+            raise ValueError("need start < stop and step > 0")
+        if (stop - start) / step > MAX_SWEEP_VALUES:
+            raise ValueError(f"sweep is limited to {MAX_SWEEP_VALUES:,} points x companies")
+        return (_companies(params), (start, stop, step))
+    if endpoint == "/key-values":
+        return (_companies(params),)
+    raise NotFound(f"unknown endpoint {endpoint}")
+
+
+def _select(table, companies):
+    if not companies:
+        return table
+    missing = [company for company in companies if company not in table.index]
+    if missing:
+        raise NotFound(f"unknown companies: {', '.join(missing)}")
+    return table.loc[list(companies)]
+
+
+def _payload(endpoint, params, table):
+    if endpoint == "/companies":
+        return {"companies": [
+            {"name": name, "fte": fte, "segment": segment}
+            for name, fte, segment in zip(table.index, table["fte"].tolist(), table["segment"].astype(str))
+        ]}
+
+    selected = _select(table, params[0])
+    names = selected.index.tolist()
+    fte = selected["fte"].to_numpy()
+
+    if endpoint == "/arr":
+        scenario_values, custom = params[1], dict(params[2])
+        # A misspelled override would otherwise silently fall back to the base case
+        unknown = sorted(set(custom) - set(table.index))
+        if unknown:
+            raise ValueError(f"custom given for unknown companies: {', '.join(unknown)}")
+        overrides = np.array([custom.get(name, np.nan) for name in names], dtype=np.float64)
+        arr = compute_arr(fte, scenario_matrix(scenario_values, overrides, scenario_values[1]))
+        return {
+            "arr_per_fte": dict(zip(SCENARIOS, scenario_values)),
+            "companies": [
+                {"name": name, "fte": f, "arr": dict(zip(SCENARIOS, row))}
+                for name, f, row in zip(names, fte.tolist(), arr.tolist())
+            ],
+        }
+
+    if endpoint == "/sensitivity":
+        arr_per_fte = np.arange(*params[1])
+        if arr_per_fte.size * len(names) > MAX_SWEEP_VALUES:
+            raise ValueError(f"sweep is limited to {MAX_SWEEP_VALUES:,} points x companies; "
+                             f"{arr_per_fte.size:,} points x {len(names):,} companies requested (narrow it with company=)")
+        arr = compute_arr(fte, arr_per_fte)
+        return {
+            "arr_per_fte": arr_per_fte.tolist(),
+            "companies": [{"name": name, "fte": f, "arr": row} for name, f, row in zip(names, fte.tolist(), arr.tolist())],
+        }
+
+    # Key-values table: one row per ARR-per-FTE value, difference between the first two companies
+    arr = compute_arr(fte, KEY_VALUES).T
+    rows = []
+    for value, row in zip(KEY_VALUES, arr.tolist()):
+        entry = {"arr_per_fte": value, "arr": dict(zip(names, row))}
+        if len(names) >= 2:
+            entry["difference"] = row[0] - row[1]
+        rows.append(entry)
+    return {"companies": names, "rows": rows}
+
+
+def make_app(path, cache_size=4096):
+    """Return ``respond(endpoint, query) -> (status, body bytes)`` and its cache."""
+    path = str(path)
+
+    @lru_cache(maxsize=cache_size)
+    def cached(endpoint, params, digest):
+        try:
+            table = load_table(path, digest)
+        except (OSError, ValueError) as error:
+            raise CompanyFileError(f"cannot read company file: {error}") from error
+        return json.dumps(_payload(endpoint, params, table), separators=(",", ":")).encode()
+
+    def respond(endpoint, query):
+        if endpoint == "/stats":
+            info = cached.cache_info()
+            return HTTPStatus.OK, json.dumps({"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}).encode()
+        try:
+            return HTTPStatus.OK, cached(endpoint, normalize(endpoint, query), file_digest(path))
+        except (CompanyFileError, OSError) as error:
+            # A missing or unparseable company file is the server's fault, not the request's
+            return HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps({"error": str(error)}).encode()
+        except NotFound as error:
+            return HTTPStatus.NOT_FOUND, json.dumps({"error": str(error)}).encode()
+        except ValueError as error:
+            return HTTPStatus.BAD_REQUEST, json.dumps({"error": str(error)}).encode()
+
+    return respond, cached
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients wait out a delayed ACK (~40 ms) on every response
+    disable_nagle_algorithm = True
+    respond = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        status, body = self.respond(url.path.rstrip("/") or "/", url.query)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the cost of cached responses
+        pass
+
+
+def serve(host, port, path, cache_size=4096):
+    respond, _ = make_app(path, cache_size)
+    handler = type("AcrylHandler", (Handler,), {"respond": staticmethod(respond)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve ARR estimates over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--companies", type=Path, default=None, help="competitor CSV/Parquet (default: $ACRYL_COMPANIES or data/companies.csv)")
+    parser.add_argument("--cache-size", type=int, default=4096, help="cached responses kept (LRU)")
+    args = parser.parse_args(argv)
+
+    path = args.companies or companies_path()
+    read_companies(path)  # fail fast on a bad file
+    server = serve(args.host, args.port, path, args.cache_size)
+    print(f"Serving ARR API for {path} on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
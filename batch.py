@@ -0,0 +1,153 @@
+"""Headless batch evaluation of the ARR model.
+
+Runs the same scenario and sensitivity calculations as the dashboard
+without importing Streamlit and streams long-format results to CSV, JSON
+Lines or Parquet, one chunk of companies at a time, so the full
+company x scenario grid never sits in memory.
+
+    python batch.py scenarios -o arr.parquet
+    python batch.py sensitivity --companies universe.csv -o - --format csv
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from companies import companies_path, read_companies
+from engine import SCENARIOS, compute_arr, scenario_matrix
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+def scenario_chunks(table, bear, base, bull, custom=None, chunk_size=50_000):
+    """Yield long (company, segment, fte, scenario, arr_per_fte, arr) frames.
+
+    ``custom`` maps company names to custom ARR per FTE; others use ``base``.
+    """
+    custom = custom or {}
+    # chunk_size counts output rows, one per company and scenario
+    rows = max(1, chunk_size // len(SCENARIOS))
+    for start in range(0, len(table), rows):
+        chunk = table.iloc[start:start + rows]
+        overrides = np.array([custom.get(company, np.nan) for company in chunk.index], dtype=np.float64)
+        arr_per_fte = scenario_matrix([bear, base, bull], overrides, base)
+        yield _long_frame(chunk, SCENARIOS, arr_per_fte, compute_arr(chunk["fte"].to_numpy(), arr_per_fte), "scenario")
+
+
+def sensitivity_chunks(table, arr_per_fte_range, chunk_size=50_000):
+    """Yield long (company, segment, fte, arr_per_fte, arr) frames over a range."""
+    arr_per_fte_range = np.asarray(arr_per_fte_range, dtype=np.float64)
+    rows = max(1, chunk_size // max(1, len(arr_per_fte_range)))
+    for start in range(0, len(table), rows):
+        chunk = table.iloc[start:start + rows]
+        arr = compute_arr(chunk["fte"].to_numpy(), arr_per_fte_range)
+        yield _long_frame(chunk, None, np.broadcast_to(arr_per_fte_range, arr.shape), arr, None)
+
+
+def _long_frame(chunk, labels, arr_per_fte, arr, label_column):
+    n, m = arr.shape
+    frame = {
+        "company": np.repeat(chunk.index.to_numpy(), m),
+        "segment": np.repeat(chunk["segment"].astype(str).to_numpy(), m),
+        "fte": np.repeat(chunk["fte"].to_numpy(), m),
+    }
+    if label_column:
+        frame[label_column] = np.tile(labels, n)
+    frame["arr_per_fte"] = np.ravel(arr_per_fte)
+    frame["arr"] = arr.ravel()
+    return pd.DataFrame(frame)
+
+
+def write_chunks(chunks, output, fmt):
+    """Stream frames to ``output`` ('-' for stdout). Returns the row count."""
+    rows = 0
+    if fmt == "parquet":
+        if output == "-":
+            raise ValueError("Parquet output needs a file path")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for frame in chunks:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output, table.schema)
+                writer.write_table(table)
+                rows += len(frame)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    out = sys.stdout if output == "-" else open(output, "w", newline="")
+    try:
+        for i, frame in enumerate(chunks):
+            if fmt == "csv":
+                frame.to_csv(out, header=i == 0, index=False)
+            else:
+                frame.to_json(out, orient="records", lines=True)
+            rows += len(frame)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return rows
+
+
+def _custom_override(value):
+    company, _, arr = value.rpartition("=")
+    if not company:
+        raise argparse.ArgumentTypeError(f"expected COMPANY=ARR_PER_FTE, got {value!r}")
+    return company, float(arr)
+
+
+def main(argv=None):
+    # Input and output options follow the command, as in the usage examples
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--companies", type=Path, default=None, help="competitor CSV/Parquet (default: $ACRYL_COMPANIES or data/companies.csv)")
+    common.add_argument("-o", "--output", default="-", help="output file, or '-' for stdout (default)")
+    common.add_argument("--format", choices=FORMATS, help="output format (default: from the output extension, else csv)")
+    common.add_argument("--chunk-size", type=int, default=50_000, help="output rows per streamed chunk")
+
+    parser = argparse.ArgumentParser(description="Evaluate ARR for every company without the dashboard.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scenarios = commands.add_parser("scenarios", parents=[common], help="ARR for every company under bear/base/bull/custom")
+    scenarios.add_argument("--bear", type=float, default=90000)
+    scenarios.add_argument("--base", type=float, default=150000)
+    scenarios.add_argument("--bull", type=float, default=250000)
+    scenarios.add_argument("--custom", type=_custom_override, action="append", default=[], metavar="COMPANY=ARR_PER_FTE",
+                           help="custom ARR per FTE for one company (repeatable); others use the base case")
+
+    sensitivity = commands.add_parser("sensitivity", parents=[common], help="ARR for every company over a range of ARR per FTE")
+    sensitivity.add_argument("--start", type=float, default=50000)
+    sensitivity.add_argument("--stop", type=float, default=300000, help="exclusive upper bound")
+    sensitivity.add_argument("--step", type=float, default=10000)
+
+    args = parser.parse_args(argv)
+    fmt = args.format or {".parquet": "parquet", ".pq": "parquet", ".json": "jsonl", ".jsonl": "jsonl"}.get(Path(args.output).suffix.lower(), "csv")
+
+    table = read_companies(args.companies or companies_path())
+    if args.command == "scenarios":
+        unknown = sorted({company for company, _ in args.custom} - set(table.index))
+        if unknown:
+            scenarios.error(f"--custom given for unknown companies: {', '.join(unknown)}")
+        chunks = scenario_chunks(table, args.bear, args.base, args.bull, dict(args.custom), args.chunk_size)
+    else:
+        chunks = sensitivity_chunks(table, np.arange(args.start, args.stop, args.step), args.chunk_size)
+
+    try:
+        rows = write_chunks(chunks, args.output, fmt)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped to head); point stdout at devnull so the exit flush stays quiet
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    print(json.dumps({"command": args.command, "companies": len(table), "rows": rows, "format": fmt, "output": args.output}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
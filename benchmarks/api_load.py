@@ -0,0 +1,139 @@
+"""Load test for the HTTP/JSON API (api.py).
+
+Starts the API in a subprocess (or targets ``--url``), then drives it from
+several client processes, each holding a few keep-alive connections, for a
+fixed duration. Requests cycle through a mix of endpoints; ``--distinct``
+sets how many different scenario tuples appear, and so how often the
+response cache misses. Reports throughput, latency percentiles, errors and
+the server's cache hit rate.
+
+    python benchmarks/api_load.py --duration 10 --workers 4 --connections 8
+    python benchmarks/api_load.py --url http://127.0.0.1:8600 --distinct 5000
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def request_paths(distinct, seed=0):
+    rng = np.random.default_rng(seed)
+    bear = rng.integers(5, 21, distinct) * 10000
+    base = rng.integers(10, 26, distinct) * 10000
+    bull = rng.integers(15, 31, distinct) * 10000
+    paths = []
+    for b, m, u in zip(bear.tolist(), base.tolist(), bull.tolist()):
+        paths.append("/arr?" + urlencode({"bear": b, "base": m, "bull": u}))
+        paths.append("/sensitivity?" + urlencode({"step": 10000 * (1 + b // 100000)}))
+    paths += ["/key-values", "/companies"]
+    rng.shuffle(paths)
+    return paths
+
+
+def client(host, port, paths, deadline, results):
+    conn = http.client.HTTPConnection(host, port)
+    latencies, errors, i = [], 0, 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request("GET", paths[i % len(paths)])
+            response = conn.getresponse()
+            response.read()
+            errors += response.status != 200
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port)
+        latencies.append(time.perf_counter() - started)
+        i += 1
+    conn.close()
+    results.append((latencies, errors))
+
+
+def worker(args):
+    host, port, paths, duration, connections, offset = args
+    paths = paths[offset:] + paths[:offset]
+    deadline = time.perf_counter() + duration
+    results = []
+    threads = [threading.Thread(target=client, args=(host, port, paths[i::connections] or paths, deadline, results)) for i in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.concatenate([np.asarray(latencies) for latencies, _ in results]), sum(errors for _, errors in results)
+
+
+def start_server(companies, cache_size):
+    command = [sys.executable, str(ROOT / "api.py"), "--port", "0", "--cache-size", str(cache_size)]
+    if companies:
+        command += ["--companies", str(companies)]
+    proc = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line:
+        raise RuntimeError("API server failed to start")
+    return proc, line.strip().rsplit(" ", 1)[-1]
+
+
+def get_json(url, path):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port)
+    conn.request("GET", path)
+    body = json.loads(conn.getresponse().read())
+    conn.close()
+    return body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure API throughput and latency.")
+    parser.add_argument("--url", default=None, help="running API to target (default: start one)")
+    parser.add_argument("--companies", type=Path, default=None, help="company file for the started server")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--workers", type=int, default=4, help="client processes")
+    parser.add_argument("--connections", type=int, default=8, help="keep-alive connections per client process")
+    parser.add_argument("--distinct", type=int, default=200, help="distinct scenario tuples in the request mix")
+    parser.add_argument("--cache-size", type=int, default=4096, help="cache size of the started server")
+    parser.add_argument("--min-rps", type=float, default=None, help="exit non-zero below this throughput")
+    args = parser.parse_args(argv)
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args.companies, args.cache_size)
+    try:
+        parts = urlsplit(url)
+        paths = request_paths(args.distinct)
+        jobs = [(parts.hostname, parts.port, paths, args.duration, args.connections, i * len(paths) // args.workers) for i in range(args.workers)]
+        with multiprocessing.Pool(args.workers) as pool:
+            outcomes = pool.map(worker, jobs)
+        stats = get_json(url, "/stats")
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    latencies = np.concatenate([latencies for latencies, _ in outcomes]) * 1000
+    errors = sum(errors for _, errors in outcomes)
+    rps = len(latencies) / args.duration
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    lookups = stats["hits"] + stats["misses"]
+    print(f"{len(latencies):,} requests in {args.duration:.0f}s from {args.workers} x {args.connections} connections: {rps:,.0f} req/s")
+    print(f"latency ms  p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {latencies.max():.2f}")
+    print(f"errors {errors}  cache hit rate {stats['hits'] / max(1, lookups):.1%} ({stats['size']:,} of {stats['max_size']:,} entries)")
+    if args.min_rps is not None and rps < args.min_rps:
+        print(f"Below --min-rps {args.min_rps:,.0f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
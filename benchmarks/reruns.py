@@ -0,0 +1,205 @@
+"""Rerun latency benchmark driven by Streamlit's AppTest.
+
+For each competitor-universe size, a synthetic company file is written
+(Collibra and Alation first, then generated companies), a fixed fraction
+of it is tracked (all of it by default, so charts, cards and tables grow
+with the size), the app is rendered once, and every sidebar/tuning slider
+is swept across its range.
+Each rerun records wall time, peak memory and the number of rendered
+elements. Results are saved as JSON keyed by the current commit;
+``--compare`` flags per-slider median regressions against an earlier file.
+
+Peak memory is the process high-water mark (VmHWM), reset before every
+rerun through /proc/self/clear_refs, which adds no overhead. On other
+platforms, or with ``--tracemalloc``, traced Python allocations are used
+instead at the price of inflated timings.
+
+    python benchmarks/reruns.py --sizes 2 100 1000 10000
+    python benchmarks/reruns.py --sizes 1000 --tracked 0.1
+    python benchmarks/reruns.py --compare benchmarks/results/reruns-<sha>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS = Path(__file__).with_name("results")
+
+SLIDERS = ["bear_slider", "base_slider", "bull_slider", "collibra_slider", "alation_slider"]
+
+
+def write_universe(path, n_companies, seed=0):
+    rng = np.random.default_rng(seed)
+    names = ["Collibra", "Alation"] + [f"Competitor {i:05d}" for i in range(max(0, n_companies - 2))]
+    fte = np.concatenate([[974, 612], rng.integers(20, 5000, max(0, n_companies - 2))])[:n_companies]
+    names = names[:n_companies]
+    pd.DataFrame({
+        "name": names,
+        "fte": fte,
+        "segment": rng.choice(["Data Catalog", "Data Quality", "Observability"], n_companies)
+    }).to_csv(path, index=False)
+    return names
+
+
+def count_elements(node):
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return float(line.split()[1])
+
+
+def timed_run(app, use_tracemalloc=False):
+    traced = use_tracemalloc or not _reset_peak_rss()
+    if traced:
+        tracemalloc.start()
+    started = time.perf_counter()
+    app.run()
+    elapsed = (time.perf_counter() - started) * 1000
+    if traced:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kb = peak / 1024
+    else:
+        peak_kb = _peak_rss_kb()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return {"ms": round(elapsed, 2), "peak_kb": round(peak_kb, 1), "elements": count_elements(app._tree)}
+
+
+def sweep(n_companies, steps, workdir, tracked_fraction=1.0, use_tracemalloc=False):
+    from streamlit.testing.v1 import AppTest
+
+    path = Path(workdir) / f"universe-{n_companies}.csv"
+    names = write_universe(path, n_companies)
+    os.environ["ACRYL_COMPANIES"] = str(path)
+    # The app tracks only the first two companies by default; track a share of the universe
+    # so reruns render per-company output that grows with its size
+    tracked = names[:max(1, round(n_companies * tracked_fraction))]
+
+    app = AppTest.from_file(str(ROOT / "acryl.py"), default_timeout=300)
+    app.run()
+    app.multiselect(key="tracked_companies").set_value(tracked)
+    sizes = {"companies": n_companies, "tracked": len(tracked)}
+    records = [dict(timed_run(app, use_tracemalloc), **sizes, slider="initial", value=None)]
+    for key in SLIDERS:
+        slider = app.slider(key=key)
+        values = np.linspace(slider.min, slider.max, steps)
+        values = (np.round(values / slider.step) * slider.step).astype(int)
+        for value in values:
+            app.slider(key=key).set_value(int(value))
+            records.append(dict(timed_run(app, use_tracemalloc), **sizes, slider=key, value=int(value)))
+    return records
+
+
+def summarize(records):
+    groups = {}
+    for record in records:
+        groups.setdefault((record["companies"], record["slider"]), []).append(record)
+    summary = []
+    for (companies, slider), group in sorted(groups.items()):
+        times = sorted(record["ms"] for record in group)
+        summary.append({
+            "companies": companies,
+            "tracked": group[0]["tracked"],
+            "slider": slider,
+            "runs": len(group),
+            "median_ms": round(statistics.median(times), 2),
+            "p95_ms": round(times[min(len(times) - 1, int(0.95 * len(times)))], 2),
+            "peak_kb": max(record["peak_kb"] for record in group),
+            "elements": max(record["elements"] for record in group),
+        })
+    return summary
+
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(summary, baseline_path, threshold):
+    baseline = {(row["companies"], row["slider"]): row for row in json.loads(Path(baseline_path).read_text())["summary"]}
+    regressions = 0
+    print(f"\nCompared with {baseline_path}:")
+    for row in summary:
+        old = baseline.get((row["companies"], row["slider"]))
+        if not old:
+            continue
+        ratio = row["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(f"{row['companies']:>7} {row['slider']:<16} {old['median_ms']:>9.1f} -> {row['median_ms']:>9.1f} ms ({ratio:>5.2f}x) {flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep every slider through AppTest and record rerun cost.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 100, 1000, 10000], help="competitor universe sizes")
+    parser.add_argument("--steps", type=int, default=5, help="values per slider sweep")
+    parser.add_argument("--tracked", type=float, default=1.0, help="fraction of each universe to track (default: all)")
+    parser.add_argument("--output", type=Path, default=None, help="results file (default: benchmarks/results/reruns-<commit>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file to compare medians against")
+    parser.add_argument("--tracemalloc", action="store_true", help="report traced Python allocations instead of peak RSS")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative median slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    records = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_companies in args.sizes:
+            records.extend(sweep(n_companies, args.steps, workdir, args.tracked, args.tracemalloc))
+    summary = summarize(records)
+
+    print(f"{'companies':>9} {'tracked':>8} {'slider':<16} {'median ms':>10} {'p95 ms':>9} {'peak KB':>10} {'elements':>9}")
+    for row in summary:
+        print(f"{row['companies']:>9} {row['tracked']:>8} {row['slider']:<16} {row['median_ms']:>10.1f} {row['p95_ms']:>9.1f} {row['peak_kb']:>10.0f} {row['elements']:>9}")
+
+    sha = commit()
+    output = args.output or RESULTS / f"reruns-{sha}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": sha,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "streamlit": __import__("streamlit").__version__,
+        "memory": "tracemalloc" if args.tracemalloc or not _reset_peak_rss() else "peak_rss",
+        "summary": summary,
+        "records": records,
+    }, indent=2) + "\n")
+    print(f"\nSaved {len(records)} reruns to {output}")
+
+    if args.compare:
+        return 1 if compare(summary, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
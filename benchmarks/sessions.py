@@ -0,0 +1,200 @@
+"""Concurrent-session load harness.
+
+Starts ``streamlit run acryl.py`` headless and opens N simultaneous
+websocket sessions against it, speaking Streamlit's protobuf protocol the
+way a browser tab does. Each session renders the page, then moves random
+sliders through the same quantized steps the UI allows; the custom sliders
+rerun only their fragment, as in the browser. Reports:
+
+- throughput (reruns/s across all sessions) and rerun latency percentiles,
+  measured from the widget change to the server's "script finished",
+- server resident memory per session (RSS growth divided by N),
+- with ``--cache-stats``, the shared caches' hit rates, read from the
+  server's per-rerun profile log (profiling adds a little overhead).
+
+The client side needs the ``websockets`` package on top of requirements.txt.
+
+    python benchmarks/sessions.py --sessions 1 10 40 --reruns 10
+    python benchmarks/sessions.py --sessions 40 --companies universe.csv --cache-stats
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SLIDERS = ["bear_slider", "base_slider", "bull_slider", "collibra_slider", "alation_slider"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, companies, log, cache_stats):
+    env = dict(os.environ)
+    if companies:
+        env["ACRYL_COMPANIES"] = str(companies.resolve())
+    if cache_stats:
+        env["ACRYL_PROFILE"] = "1"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(ROOT / "acryl.py"), "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=log
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Streamlit server did not come up")
+
+
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return float(line.split()[1])
+
+
+class Session:
+    def __init__(self, ws):
+        self.ws = ws
+        self.sliders = {}
+        self.states = {}
+        self.errors = []
+
+    async def run(self, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.fragment_id = fragment_id
+        for widget_id, value in self.states.items():
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            state.double_array_value.data.append(value)
+        await self.ws.send(msg.SerializeToString())
+
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                if element.WhichOneof("type") == "slider":
+                    key = element.slider.id.rsplit("-", 1)[-1]
+                    self.sliders[key] = (element.slider, forward.delta.fragment_id)
+                elif element.WhichOneof("type") == "exception":
+                    self.errors.append(element.exception.message)
+            elif kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return
+
+
+async def session(url, index, reruns, ready, go, timings):
+    import websockets
+
+    rng = np.random.default_rng(index)
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        client = Session(ws)
+        await client.run()
+        ready.set_result(None)
+        await go.wait()
+        keys = [key for key in SLIDERS if key in client.sliders]
+        for _ in range(reruns):
+            slider, fragment_id = client.sliders[keys[rng.integers(len(keys))]]
+            steps = int(round((slider.max - slider.min) / slider.step))
+            client.states[slider.id] = slider.min + rng.integers(steps + 1) * slider.step
+            started = time.perf_counter()
+            await client.run(fragment_id)
+            timings.append(time.perf_counter() - started)
+        return client.errors
+
+
+async def measure(port, n_sessions, reruns, pid):
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    before = rss_kb(pid)
+    loop = asyncio.get_running_loop()
+    ready = [loop.create_future() for _ in range(n_sessions)]
+    go = asyncio.Event()
+    timings = []
+    tasks = [asyncio.create_task(session(url, i, reruns, ready[i], go, timings)) for i in range(n_sessions)]
+
+    # All sessions open the page together, as in the planning meeting
+    started = time.perf_counter()
+    await asyncio.gather(*ready)
+    first_render = time.perf_counter() - started
+    go.set()
+    started = time.perf_counter()
+    errors = [error for errors in await asyncio.gather(*tasks) for error in errors]
+    elapsed = time.perf_counter() - started
+
+    timings = np.asarray(timings) * 1000
+    return {
+        "sessions": n_sessions,
+        "first_render_s": first_render,
+        "reruns_per_s": len(timings) / elapsed,
+        "p50_ms": np.percentile(timings, 50),
+        "p95_ms": np.percentile(timings, 95),
+        "rss_per_session_kb": (rss_kb(pid) - before) / n_sessions,
+        "errors": errors,
+    }
+
+
+def last_cache_stats(log_path):
+    caches = None
+    for line in Path(log_path).read_text().splitlines():
+        if line.startswith("{") and '"caches"' in line:
+            caches = json.loads(line)["caches"]
+    return caches or []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent browser sessions moving sliders.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 40], help="concurrent session counts to measure")
+    parser.add_argument("--reruns", type=int, default=10, help="slider moves per session")
+    parser.add_argument("--companies", type=Path, default=None, help="company file (default: $ACRYL_COMPANIES or data/companies.csv)")
+    parser.add_argument("--cache-stats", action="store_true", help="profile the server and report shared cache hit rates")
+    args = parser.parse_args(argv)
+
+    port = free_port()
+    with tempfile.NamedTemporaryFile("w+", suffix=".log") as log:
+        proc = start_server(port, args.companies, log, args.cache_stats)
+        try:
+            # Warm-up: the first session pays for imports and the cold caches
+            asyncio.run(measure(port, 1, 1, proc.pid))
+            print(f"{'sessions':>8} {'open s':>7} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'RSS/session KB':>15}")
+            failed = False
+            for n_sessions in args.sessions:
+                result = asyncio.run(measure(port, n_sessions, args.reruns, proc.pid))
+                print(f"{n_sessions:>8} {result['first_render_s']:>7.2f} {result['reruns_per_s']:>9.1f} {result['p50_ms']:>8.1f} "
+                      f"{result['p95_ms']:>8.1f} {result['rss_per_session_kb']:>15,.0f}")
+                for error in result["errors"][:3]:
+                    print(f"  error: {error}")
+                failed |= bool(result["errors"])
+            if args.cache_stats:
+                log.flush()
+                for row in last_cache_stats(log.name):
+                    print(f"{row['cache']:<20} {row['calls']:>8,} calls  {row['hit_rate']:>6.1%} hits")
+        finally:
+            proc.terminate()
+            proc.wait()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
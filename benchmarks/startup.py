@@ -0,0 +1,92 @@
+"""Cold-start benchmark for the dashboard.
+
+Each repeat starts a fresh interpreter with ``python -X importtime`` that
+renders the app once through Streamlit's AppTest, then reports:
+
+- total import time (sum of top-level ``-X importtime`` entries),
+- the slowest top-level imports,
+- time to first render, from process launch (so interpreter startup is
+  included) to the end of the first run,
+
+and compares the medians against ``startup_budget.json``. Exits non-zero
+when over budget.
+
+    python benchmarks/startup.py [--repeat 5] [--update-budget]
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET = Path(__file__).with_name("startup_budget.json")
+
+# Prints the wall-clock time its first run finished; probe() subtracts the launch time
+PROBE = """
+import json, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app!r}, default_timeout=120)
+app.run()
+assert not app.exception, app.exception
+print(json.dumps({{"rendered_at": time.time()}}))
+"""
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def probe(app):
+    # Wall clock on both sides: the child's monotonic clocks share no origin with ours
+    launched = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(app=str(app))],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    top_level = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and not match.group(3):
+            top_level[match.group(4)] = int(match.group(2)) / 1000
+    render_ms = (json.loads(proc.stdout.strip().splitlines()[-1])["rendered_at"] - launched) * 1000
+    return sum(top_level.values()), top_level, render_ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", type=Path, default=ROOT / "acryl.py")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    parser.add_argument("--update-budget", action="store_true", help="store current medians plus 25%% headroom as the budget")
+    args = parser.parse_args(argv)
+
+    runs = [probe(args.app) for _ in range(args.repeat)]
+    import_ms = statistics.median(run[0] for run in runs)
+    render_ms = statistics.median(run[2] for run in runs)
+    slowest = sorted(runs[-1][1].items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print(f"{'module':<40} {'cumulative ms':>14}")
+    for module, ms in slowest:
+        print(f"{module:<40} {ms:>14.1f}")
+    print()
+
+    measured = {"import_ms": round(import_ms, 1), "first_render_ms": round(render_ms, 1)}
+    if args.update_budget:
+        budget = {key: round(value * 1.25) for key, value in measured.items()}
+        BUDGET.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Budget updated: {budget}")
+        return 0
+
+    budget = json.loads(BUDGET.read_text())
+    over = False
+    for key, value in measured.items():
+        status = "ok" if value <= budget[key] else "OVER"
+        over |= status == "OVER"
+        print(f"{key:<16} {value:>10.1f} ms  budget {budget[key]:>8} ms  {status}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
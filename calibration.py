@@ -0,0 +1,143 @@
+"""ARR-per-FTE calibration from comparable companies with reported ARR.
+
+The comparables file (CSV or Parquet: name, fte, arr, optional segment) is
+fit per segment with least squares through the origin, ARR = k x FTE, so
+k = sum(fte * arr) / sum(fte^2). Confidence intervals come from a Poisson
+bootstrap: every resample weights each row by a Poisson(1) count, which
+approximates redrawing each segment's rows with replacement without
+materializing indices, and each segment's weighted sums are one matrix
+product. Resamples are processed in chunks so memory stays bounded, and
+capped for large files. The pooled "All" row sums the segment sums of the
+same resamples. Bear and bull seeds come from the spread of individual
+companies' ARR per FTE rather than from the fit's interval.
+
+    python calibration.py --resamples 20000 --confidence 0.8
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATH = Path(__file__).parent / "data" / "comparables.csv"
+
+POOLED = "All"
+MIN_RESAMPLES = 1000
+
+
+def comparables_path():
+    """Path of the comparables file, overridable with ACRYL_COMPARABLES."""
+    return Path(os.environ.get("ACRYL_COMPARABLES", DEFAULT_PATH))
+
+
+def read_comparables(path):
+    """Parse a comparables CSV or Parquet file; rows without a usable FTE or ARR are dropped."""
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype={"name": str, "segment": str})
+
+    missing = {"name", "fte", "arr"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path} is missing required column(s): {', '.join(sorted(missing))}")
+    if "segment" not in df:
+        df["segment"] = None
+
+    df = df[["name", "fte", "arr", "segment"]].copy()
+    df["fte"] = pd.to_numeric(df["fte"], errors="raise").astype("float64")
+    df["arr"] = pd.to_numeric(df["arr"], errors="raise").astype("float64")
+    df["segment"] = df["segment"].fillna("Unassigned")
+    df = df[(df["fte"] > 0) & df["arr"].notna()]
+    if df.empty:
+        raise ValueError(f"{path} has no rows with a positive FTE and a reported ARR")
+    return df.reset_index(drop=True)
+
+
+def calibrate(comparables, resamples=10_000, confidence=0.8, seed=0, max_draws=5_000_000, chunk_elements=4_000_000):
+    """Fit ARR per FTE by segment and bootstrap a ``confidence`` interval.
+
+    Returns a frame indexed by segment, plus a pooled "All" row, with the
+    company count, the least-squares ``arr_per_fte``, the interval bounds
+    ``low`` and ``high`` of that fit, and ``company_low``/``company_high``,
+    the same percentiles of the individual companies' ARR per FTE. The fit's
+    interval narrows as comparables are added; the company spread does not,
+    so it is what seeds the bear and bull cases.
+
+    Resamples are capped so resamples x companies stays within ``max_draws``
+    (never below MIN_RESAMPLES).
+    """
+    df = comparables.sort_values("segment", kind="stable")
+    segments, codes = np.unique(df["segment"].to_numpy(dtype=str), return_inverse=True)
+    fte = df["fte"].to_numpy(dtype=np.float64)
+    arr = df["arr"].to_numpy(dtype=np.float64)
+    sizes = np.bincount(codes)
+    bounds = np.append(0, np.cumsum(sizes))
+
+    sxy = np.bincount(codes, fte * arr)
+    sxx = np.bincount(codes, fte * fte)
+    point = np.append(sxy / sxx, sxy.sum() / sxx.sum())
+
+    # Poisson(1) weights approximate drawing each segment's rows with replacement;
+    # each segment's weighted sums are one matmul against its (fte * arr, fte^2) block
+    products = np.column_stack([fte * arr, fte * fte])
+    resamples = min(resamples, max(MIN_RESAMPLES, max_draws // len(fte)))
+    rng = np.random.default_rng(seed)
+    estimates = np.empty((resamples, len(segments) + 1))
+    chunk = max(1, chunk_elements // len(fte))
+    for begin in range(0, resamples, chunk):
+        b = min(chunk, resamples - begin)
+        weights = rng.poisson(1.0, (b, len(fte))).astype(np.float64)
+        sums = np.stack([weights[:, lo:hi] @ products[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])], axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # A segment that drew no rows has no estimate in that resample
+            estimates[begin:begin + b, :-1] = sums[:, :, 0] / sums[:, :, 1]
+            estimates[begin:begin + b, -1] = sums[:, :, 0].sum(axis=1) / sums[:, :, 1].sum(axis=1)
+
+    tail = (1 - confidence) / 2
+    low, high = np.nanquantile(estimates, [tail, 1 - tail], axis=0)
+    ratio = arr / fte
+    spread = np.array([np.quantile(ratio[lo:hi], [tail, 1 - tail]) for lo, hi in zip(bounds[:-1], bounds[1:])]
+                      + [np.quantile(ratio, [tail, 1 - tail])])
+    return pd.DataFrame({
+        "companies": np.append(sizes, len(fte)),
+        "arr_per_fte": point,
+        "low": low,
+        "high": high,
+        "company_low": spread[:, 0],
+        "company_high": spread[:, 1],
+    }, index=pd.Index(list(segments) + [POOLED], name="segment"))
+
+
+def seed_scenarios(fit, bounds, step=10000):
+    """Bear/base/bull slider values from one row of ``calibrate``.
+
+    Base is the fitted ARR per FTE; bear and bull are the low and high
+    percentiles of individual companies' ARR per FTE (not the fit's
+    interval, which collapses onto base with many comparables). Values are
+    rounded to the slider ``step`` and clamped to each slider's (min, max)
+    in ``bounds``.
+    """
+    values = {"bear": fit["company_low"], "base": fit["arr_per_fte"], "bull": fit["company_high"]}
+    return {
+        name: int(min(max(round(value / step) * step, bounds[name][0]), bounds[name][1]))
+        for name, value in values.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit ARR per FTE by segment from comparable companies.")
+    parser.add_argument("--comparables", type=Path, default=None, help="comparables CSV/Parquet (default: $ACRYL_COMPARABLES or data/comparables.csv)")
+    parser.add_argument("--resamples", type=int, default=10_000, help="bootstrap resamples")
+    parser.add_argument("--confidence", type=float, default=0.8, help="interval coverage (0.8 = P10 to P90)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    fit = calibrate(read_comparables(args.comparables or comparables_path()), args.resamples, args.confidence, args.seed)
+    fit.to_csv(sys.stdout, float_format="%.0f")
+
+
+if __name__ == "__main__":
+    main()
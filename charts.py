@@ -0,0 +1,351 @@
+"""Altair chart builders for the dashboard.
+
+Every builder takes plain hashable values (tuples, numbers, strings) and
+returns a Vega-Lite spec dict, so the app can memoize a finished spec on
+exactly the inputs that shape it. ``theme`` is a ``(chart_bg, axis_text_color)``
+pair and ``scenario_colors`` a ``(bear, base, bull)`` color triple.
+
+Charts redrawn on every sidebar move (the scenario comparison and ARR per FTE
+bars) build their Altair spec once per structure and then only swap in new
+rows: parsing the encodings costs ~50 ms, a row swap well under 1 ms.
+
+Layers drawing the same rows share one named dataset, named after its
+content, so an unchanged chart is byte-identical across reruns and the
+browser's message cache can skip re-sending it.
+"""
+import functools
+import hashlib
+import json
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+CUSTOM_COLOR = "#9CA3AF"
+SCENARIO_LABELS = ("Bear Case", "Base Case", "Bull Case")
+PERCENTILES = ("P10", "P50", "P90")
+
+
+def themed(chart, theme):
+    chart_bg, axis_text_color = theme
+    return chart.configure_view(
+        strokeWidth=0,
+        fill=chart_bg
+    ).configure_axis(
+        labelColor=axis_text_color,
+        titleColor=axis_text_color
+    )
+
+
+def with_rows(spec, frame):
+    """Shallow copy of a single-dataset ``spec`` holding ``frame``'s rows.
+
+    Like Altair, the dataset is named after its content, so new rows
+    reach the browser under a new name.
+    """
+    name, rows = _dataset(frame)
+    return dict(spec, data={"name": name}, datasets={name: rows})
+
+
+def _dataset(frame):
+    rows = frame.to_dict(orient="records")
+    return "data-" + hashlib.md5(json.dumps(rows, sort_keys=True).encode()).hexdigest(), rows
+
+
+def _named(frame):
+    """(named data, datasets) for a frame whose row count grows with the tracked companies.
+
+    Named data skips Altair's inline 5,000 row guard; the app bounds these
+    rows itself through its chart budget. Fields must carry explicit types,
+    as Altair cannot infer them without the frame. Merge the datasets into
+    the finished spec with :func:`_with_datasets`.
+    """
+    name, rows = _dataset(frame)
+    return alt.NamedData(name=name), {name: rows}
+
+
+def _with_datasets(spec, datasets):
+    spec["datasets"] = dict(spec.get("datasets", {}), **datasets)
+    return spec
+
+
+def compact(spec):
+    """Copy of ``spec`` with each named dataset as a frame of dictionary-encoded labels.
+
+    Streamlit sends named datasets as Arrow tables, so labels repeated on
+    every row (company, scenario, date) go out once plus a small code per
+    row instead of as a string per row. Dataset names are unchanged.
+    """
+    if "datasets" not in spec:
+        return spec
+    datasets = {}
+    for name, rows in spec["datasets"].items():
+        frame = pd.DataFrame.from_records(rows)
+        for column in frame.columns[frame.dtypes == object]:
+            frame[column] = frame[column].astype("category")
+        datasets[name] = frame
+    return dict(spec, datasets=datasets)
+
+
+def scenario_comparison(companies, scenarios, arr_millions, scenario_colors, theme):
+    """Grouped bars of ARR per company, one column per scenario.
+
+    ``arr_millions`` is flattened company-major: each company's values in
+    ``scenarios`` order.
+    """
+    chart_df = pd.DataFrame({
+        "Company": np.repeat(companies, len(scenarios)),
+        "Scenario": np.tile(scenarios, len(companies)),
+        "ARR (Millions)": np.ravel(arr_millions)
+    })
+    return with_rows(_scenario_comparison_template(scenarios, scenario_colors, theme), chart_df)
+
+
+@functools.lru_cache(maxsize=64)
+def _scenario_comparison_template(scenarios, scenario_colors, theme):
+    empty = pd.DataFrame({"Company": [], "Scenario": [], "ARR (Millions)": []})
+    chart = alt.Chart(empty).mark_bar().encode(
+        x=alt.X('Company:N'),
+        y=alt.Y('ARR (Millions):Q', title='ARR ($ Millions)'),
+        color=alt.Color('Scenario:N', scale=alt.Scale(
+            domain=list(scenarios),
+            range=list(scenario_colors) + [CUSTOM_COLOR]
+        )),
+        column=alt.Column('Scenario:N'),
+        tooltip=['Company:N', 'Scenario:N', 'ARR (Millions):Q']
+    ).properties(width=120)
+
+    return themed(chart, theme).to_dict()
+
+
+def arr_per_fte_comparison(labels, values_k, colors, theme):
+    """Bars of the ARR per FTE ($K) behind each scenario and custom override."""
+    ratio_data = pd.DataFrame({
+        "Scenario": labels,
+        "ARR per FTE ($K)": values_k
+    })
+    return with_rows(_arr_per_fte_comparison_template(labels, colors, theme), ratio_data)
+
+
+@functools.lru_cache(maxsize=64)
+def _arr_per_fte_comparison_template(labels, colors, theme):
+    empty = pd.DataFrame({"Scenario": [], "ARR per FTE ($K)": []})
+    ratio_chart = alt.Chart(empty).mark_bar().encode(
+        x=alt.X('Scenario:N', title='Scenario', sort=None),
+        y=alt.Y('ARR per FTE ($K):Q', title='ARR per FTE ($K)'),
+        color=alt.Color('Scenario:N', scale=alt.Scale(
+            domain=list(labels),
+            range=list(colors)
+        )),
+        tooltip=['Scenario:N', 'ARR per FTE ($K):Q']
+    ).properties(height=300)
+
+    return themed(ratio_chart, theme).to_dict()
+
+
+def sensitivity(companies, ftes, colors, arr_per_fte_k, scenario_values_k, scenario_colors, theme, mc_quantiles_k=None):
+    """ARR curves over a range of ARR per FTE with bear/base/bull markers.
+
+    ``mc_quantiles_k`` optionally shades a simulated P10-P90 band with a P50 rule.
+    """
+    arr_per_fte_k = np.asarray(arr_per_fte_k, dtype=np.float64)
+    columns = [f"{company} ARR ($M)" for company in companies]
+    arr_m = np.multiply.outer(np.asarray(ftes, dtype=np.float64), arr_per_fte_k) / 1000
+
+    sensitivity_melted = pd.DataFrame({
+        'ARR per FTE ($K)': np.tile(arr_per_fte_k, len(companies)),
+        'Company': np.repeat(columns, len(arr_per_fte_k)),
+        'ARR ($M)': arr_m.ravel()
+    })
+
+    curves, datasets = _named(sensitivity_melted)
+    line_chart = alt.Chart(curves).mark_line(
+        strokeWidth=3
+    ).encode(
+        x=alt.X('ARR per FTE ($K):Q', title='ARR per FTE ($K)'),
+        y=alt.Y('ARR ($M):Q', title='ARR ($ Millions)'),
+        color=alt.Color('Company:N', scale=alt.Scale(
+            domain=columns,
+            range=list(colors)
+        )),
+        tooltip=['Company:N', 'ARR per FTE ($K):Q', 'ARR ($M):Q']
+    ).properties(
+        height=500
+    )
+
+    # Labels stack just under the top of the tallest curve. All markers share one dataset
+    # drawn by a rule and a text layer; the curves' dataset keeps its name when they move.
+    label_y = arr_m.max() if arr_m.size else 0
+    labels = SCENARIO_LABELS[:len(scenario_values_k)]
+    markers = alt.Chart(pd.DataFrame({
+        'x': scenario_values_k,
+        'y': label_y * np.array((0.9, 0.95, 1.0))[:len(scenario_values_k)],
+        'Scenario': labels
+    })).encode(
+        x='x:Q',
+        color=alt.Color('Scenario:N', scale=alt.Scale(domain=list(labels), range=list(scenario_colors)[:len(labels)]), legend=None)
+    )
+    layers = [
+        line_chart,
+        markers.mark_rule(strokeDash=[5, 5], strokeWidth=2),
+        markers.mark_text(align='left', baseline='middle', dx=5, fontWeight='bold').encode(y='y:Q', text='Scenario:N')
+    ]
+
+    if mc_quantiles_k is not None:
+        # Shade the simulated P10-P90 ARR per FTE band behind the curves, from one row
+        p10, p50, p90 = mc_quantiles_k
+        band = alt.Chart(pd.DataFrame({'P10': [p10], 'P50': [p50], 'P90': [p90]}))
+        layers[:0] = [
+            band.mark_rect(color=CUSTOM_COLOR, opacity=0.15).encode(x='P10:Q', x2='P90:Q'),
+            band.mark_rule(color=CUSTOM_COLOR, strokeWidth=2).encode(x='P50:Q')
+        ]
+
+    # Curves and markers each keep their own color scale
+    return _with_datasets(themed(alt.layer(*layers).resolve_scale(color='independent'), theme).to_dict(), datasets)
+
+
+def percentile_bands(companies, bands_m, colors, theme):
+    """P10-P90 ARR ranges per company with a P50 tick."""
+    band_df = pd.DataFrame(np.asarray(bands_m, dtype=np.float64).reshape(-1, len(PERCENTILES)), columns=PERCENTILES)
+    band_df.insert(0, "Company", companies)
+    _, axis_text_color = theme
+
+    bands, datasets = _named(band_df)
+    band_chart = alt.Chart(bands).encode(
+        y=alt.Y('Company:N', sort=list(companies)),
+        color=alt.Color('Company:N', scale=alt.Scale(
+            domain=list(companies),
+            range=list(colors)
+        ), legend=None)
+    )
+    band_chart = band_chart.mark_rule(strokeWidth=8, opacity=0.6).encode(
+        x=alt.X('P10:Q', title='ARR ($ Millions), P10 to P90'), x2='P90:Q',
+        tooltip=['Company:N'] + [alt.Tooltip(f'{p}:Q', format='.1f') for p in PERCENTILES]
+    ) + band_chart.mark_tick(thickness=3, size=20, color=axis_text_color).encode(x='P50:Q')
+
+    return _with_datasets(themed(band_chart.properties(height=60 + 40 * len(companies)), theme).to_dict(), datasets)
+
+
+def arr_histograms(companies, ftes, colors, left, right, density, theme):
+    """Overlaid ARR ($M) histograms, one per company, from a shared per-FTE histogram."""
+    ftes = np.asarray(ftes, dtype=np.float64)
+    hist_df = pd.DataFrame({
+        "Company": np.repeat(companies, len(density)),
+        "From": np.outer(ftes, left).ravel() / 1000000,
+        "To": np.outer(ftes, right).ravel() / 1000000,
+        "Probability": np.tile(density, len(companies))
+    })
+
+    histograms, datasets = _named(hist_df)
+    hist_chart = alt.Chart(histograms).mark_rect(opacity=0.5).encode(
+        x=alt.X('From:Q', title='ARR ($ Millions)'), x2='To:Q',
+        y=alt.Y('Probability:Q', stack=None), y2=alt.datum(0),
+        color=alt.Color('Company:N', scale=alt.Scale(
+            domain=list(companies),
+            range=list(colors)
+        )),
+        tooltip=['Company:N', alt.Tooltip('From:Q', format='.1f'), alt.Tooltip('To:Q', format='.1f'), alt.Tooltip('Probability:Q', format='.2%')]
+    ).properties(height=60 + 40 * len(companies))
+
+    return _with_datasets(themed(hist_chart, theme).to_dict(), datasets)
+
+
+def arr_per_fte_histogram(left_k, right_k, density, quantiles_k, color, theme):
+    """Histogram of simulated ARR per FTE ($K) with P10/P50/P90 rules."""
+    _, axis_text_color = theme
+
+    mc_hist = alt.Chart(pd.DataFrame({"From": left_k, "To": right_k, "Probability": density})).mark_rect(
+        color=color
+    ).encode(
+        x=alt.X('From:Q', title='ARR per FTE ($K)'), x2='To:Q',
+        y=alt.Y('Probability:Q'), y2=alt.datum(0),
+        tooltip=[alt.Tooltip('From:Q', format='.0f'), alt.Tooltip('To:Q', format='.0f'), alt.Tooltip('Probability:Q', format='.2%')]
+    )
+    mc_rules = alt.Chart(pd.DataFrame({'x': quantiles_k, 'Percentile': PERCENTILES})).mark_rule(
+        strokeDash=[4, 4], strokeWidth=2, color=axis_text_color
+    ).encode(x='x:Q', tooltip=['Percentile', alt.Tooltip('x:Q', title='ARR per FTE ($K)', format='.0f')])
+
+    return themed((mc_hist + mc_rules).properties(height=250), theme).to_dict()
+
+
+def sensitivity_surface(arr_per_fte_k, fte_change_pct, arr_m, scenario_values_k, scenario_colors, theme):
+    """Heatmap of total ARR ($M) over ARR per FTE ($K) x FTE change (%).
+
+    ``arr_m`` is the already downsampled grid flattened row-major, one row
+    per FTE change. Scenario values are marked at 0% FTE change.
+    """
+    arr_per_fte_k = np.asarray(arr_per_fte_k, dtype=np.float64)
+    fte_change_pct = np.asarray(fte_change_pct, dtype=np.float64)
+    dx = np.diff(arr_per_fte_k).mean() if arr_per_fte_k.size > 1 else 1.0
+    dy = np.diff(fte_change_pct).mean() if fte_change_pct.size > 1 else 1.0
+
+    # Cells are centered on the block means returned by engine.downsample_axis()
+    surface_df = pd.DataFrame({
+        "ARR per FTE ($K)": np.tile(arr_per_fte_k, fte_change_pct.size),
+        "FTE Change (%)": np.repeat(fte_change_pct, arr_per_fte_k.size),
+        "ARR ($M)": np.asarray(arr_m, dtype=np.float64)
+    })
+    heatmap = alt.Chart(surface_df).transform_calculate(
+        x=f"datum['ARR per FTE ($K)'] - {dx / 2}",
+        x2=f"datum['ARR per FTE ($K)'] + {dx / 2}",
+        y=f"datum['FTE Change (%)'] - {dy / 2}",
+        y2=f"datum['FTE Change (%)'] + {dy / 2}"
+    ).mark_rect().encode(
+        x=alt.X('x:Q', title='ARR per FTE ($K)', scale=alt.Scale(nice=False, zero=False)), x2='x2:Q',
+        y=alt.Y('y:Q', title='FTE Change (%)', scale=alt.Scale(nice=False, zero=False)), y2='y2:Q',
+        color=alt.Color('ARR ($M):Q', title='Total ARR ($M)', scale=alt.Scale(scheme='viridis')),
+        tooltip=[alt.Tooltip('ARR per FTE ($K):Q', format='.0f'), alt.Tooltip('FTE Change (%):Q', format='.0f'), alt.Tooltip('ARR ($M):Q', format='.1f')]
+    )
+    markers = alt.Chart(pd.DataFrame({
+        "x": scenario_values_k,
+        "y": [0.0] * len(scenario_values_k),
+        "Scenario": SCENARIO_LABELS[:len(scenario_values_k)]
+    })).mark_point(size=120, filled=True, stroke='white', strokeWidth=1.5).encode(
+        x='x:Q', y='y:Q',
+        color=alt.Color('Scenario:N', scale=alt.Scale(domain=list(SCENARIO_LABELS), range=list(scenario_colors)), legend=None),
+        tooltip=['Scenario', alt.Tooltip('x:Q', title='ARR per FTE ($K)', format='.0f')]
+    )
+
+    return themed(alt.layer(heatmap, markers).resolve_scale(color='independent').properties(height=450), theme).to_dict()
+
+
+def arr_trajectory(dates, companies, colors, bear_m, base_m, bull_m, theme):
+    """Base case ARR ($M) over time per company with a bear-to-bull band.
+
+    ``dates`` are ISO strings; the ARR arguments are flattened (T, N) arrays.
+    """
+    return _fan(dates, companies, colors, bear_m, base_m, bull_m, 'Snapshot', 350, theme)
+
+
+def arr_projection(dates, companies, colors, bear_m, base_m, bull_m, theme):
+    """Projected base case ARR ($M) per company, fanning out to the bear and bull cases.
+
+    ``dates`` are ISO dates three months apart from today; the ARR arguments are flattened (T, N) arrays.
+    """
+    return _fan(dates, companies, colors, bear_m, base_m, bull_m, 'Quarter', 300, theme)
+
+
+def _fan(dates, companies, colors, bear_m, base_m, bull_m, x_title, height, theme):
+    fan_df = pd.DataFrame({
+        "Date": np.repeat(dates, len(companies)),
+        "Company": np.tile(companies, len(dates)),
+        "Bear": bear_m,
+        "Base": base_m,
+        "Bull": bull_m
+    }).dropna()
+
+    color = alt.Color('Company:N', scale=alt.Scale(
+        domain=list(companies),
+        range=list(colors)
+    ))
+    fans, datasets = _named(fan_df)
+    base = alt.Chart(fans).encode(x=alt.X('Date:T', title=x_title), color=color)
+    band = base.mark_area(opacity=0.2).encode(
+        y=alt.Y('Bear:Q', title='ARR ($ Millions)'), y2='Bull:Q'
+    )
+    line = base.mark_line(strokeWidth=3, point=True).encode(
+        y='Base:Q',
+        tooltip=[alt.Tooltip('Date:T'), 'Company:N'] + [alt.Tooltip(f'{s}:Q', format='.1f') for s in ('Bear', 'Base', 'Bull')]
+    )
+
+    return _with_datasets(themed((band + line).properties(height=height), theme).to_dict(), datasets)
@@ -0,0 +1,88 @@
+"""Competitor universe loading.
+
+The table lives in a local CSV or Parquet file with one row per company
+(name, fte, segment, color, fte_growth) and is parsed into a name-indexed
+frame. ``fte_growth`` is the expected annual headcount growth (0.1 = +10%)
+used by forward projections; it is optional and NaN where unknown. The
+dashboard watches the file (see watch.py) and re-parses it whenever its
+content hash changes.
+"""
+import hashlib
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATH = Path(__file__).parent / "data" / "companies.csv"
+
+COLUMNS = ["name", "fte", "segment", "color", "fte_growth"]
+
+# Bright colors that are visible in both themes, cycled for rows without a color
+PALETTE = ["#818CF8", "#38BDF8", "#F472B6", "#FBBF24", "#34D399", "#A78BFA", "#FB923C", "#2DD4BF"]
+
+# Hex (#rgb, #rgba, #rrggbb, #rrggbbaa) or a CSS color name; colors end up in inline styles
+COLOR = re.compile(r"#(?:[0-9A-Fa-f]{3,4}|[0-9A-Fa-f]{6}|[0-9A-Fa-f]{8})|[A-Za-z]+")
+
+
+def companies_path():
+    """Path of the competitor file, overridable with ACRYL_COMPANIES."""
+    return Path(os.environ.get("ACRYL_COMPANIES", DEFAULT_PATH))
+
+
+def file_digest(path):
+    """Content hash of ``path``, recomputed only when its size or mtime change."""
+    stat = os.stat(path)
+    return _digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _digest(path, mtime_ns, size):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_companies(path):
+    """Parse a competitor CSV or Parquet file into a frame indexed by name."""
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype={"name": str, "segment": str, "color": str})
+
+    missing = {"name", "fte"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path} is missing required column(s): {', '.join(sorted(missing))}")
+    if df["name"].duplicated().any():
+        dupes = df.loc[df["name"].duplicated(), "name"].unique()[:5]
+        raise ValueError(f"{path} has duplicate company names: {', '.join(dupes)}")
+
+    if "segment" not in df:
+        df["segment"] = None
+    if "color" not in df:
+        df["color"] = None
+    if "fte_growth" not in df:
+        df["fte_growth"] = np.nan
+
+    df = df[COLUMNS].copy()
+    df["fte"] = pd.to_numeric(df["fte"], errors="raise").astype("float64")
+    df["fte_growth"] = pd.to_numeric(df["fte_growth"], errors="raise").astype("float64")
+    # Headcount must be a non-negative number; growth of -100% or less has no compound rate
+    _check(path, df, ~(np.isfinite(df["fte"]) & (df["fte"] >= 0)), "missing, infinite or negative fte")
+    _check(path, df, (df["fte_growth"] <= -1) | np.isinf(df["fte_growth"]), "infinite fte_growth or fte_growth of -1 (-100%) or less")
+    df["segment"] = df["segment"].fillna("Unassigned").astype("category")
+    palette = pd.Series([PALETTE[i % len(PALETTE)] for i in range(len(df))], index=df.index)
+    df["color"] = df["color"].fillna(palette)
+    _check(path, df, ~df["color"].astype(str).str.fullmatch(COLOR), "invalid colors (expected hex or a color name)")
+    return df.set_index("name")
+
+
+def _check(path, df, invalid, problem):
+    if invalid.any():
+        bad = df.loc[invalid, "name"].astype(str).unique()[:5]
+        raise ValueError(f"{path} has {problem} for: {', '.join(bad)}")
@@ -0,0 +1,94 @@
+"""Vectorized ARR estimation engine.
+
+Pure NumPy with no Streamlit dependency, so the same math backs the
+dashboard, batch jobs and ad-hoc scripts.
+"""
+import numpy as np
+
+# Column order of the scenario matrix built by scenario_matrix()
+SCENARIOS = ("Bear", "Base", "Bull", "Custom")
+
+# Sensitivity sweep (start, exclusive stop, step) and the ARR-per-FTE values of
+# the key-values table, shared by the dashboard and the HTTP API
+SENSITIVITY_RANGE = (50000, 300000, 10000)
+KEY_VALUES = (100000, 125000, 150000, 175000, 200000, 225000, 250000)
+
+
+def scenario_matrix(scenario_values, custom, fallback):
+    """Return the (N, M + 1) ARR-per-FTE matrix for N companies.
+
+    ``scenario_values`` holds the M values shared by every company and
+    ``custom`` the per-company override column; NaN overrides fall back to
+    ``fallback`` (the base case in the dashboard).
+    """
+    shared = np.asarray(scenario_values, dtype=np.float64)
+    custom = np.asarray(custom, dtype=np.float64)
+    custom = np.where(np.isnan(custom), fallback, custom)
+
+    matrix = np.empty((custom.size, shared.size + 1), dtype=np.float64)
+    matrix[:, :-1] = shared
+    matrix[:, -1] = custom
+    return matrix
+
+
+def compute_arr(fte, arr_per_fte):
+    """Estimate ARR for every company under every ARR-per-FTE value.
+
+    ``fte`` is a length-N array. ``arr_per_fte`` is either a length-M vector
+    shared by all companies (e.g. a sensitivity range) or an (N, M) matrix
+    with per-company values. Returns an (N, M) float64 array.
+    """
+    fte = np.asarray(fte, dtype=np.float64)
+    arr_per_fte = np.asarray(arr_per_fte, dtype=np.float64)
+    return fte[:, np.newaxis] * arr_per_fte
+
+
+def sensitivity_surface(fte, arr_per_fte, fte_change):
+    """Total ARR of the given companies over an FTE change x ARR-per-FTE grid.
+
+    ``fte_change`` holds relative headcount changes (0.1 = +10%). Returns a
+    (len(fte_change), len(arr_per_fte)) array. Summing over companies before
+    broadcasting keeps the cost at one grid regardless of N.
+    """
+    headcount = np.asarray(fte, dtype=np.float64).sum() * (1 + np.asarray(fte_change, dtype=np.float64))
+    return np.multiply.outer(headcount, np.asarray(arr_per_fte, dtype=np.float64))
+
+
+def project_arr(fte, arr_per_fte, fte_growth, arr_per_fte_drift, periods, periods_per_year=4):
+    """Project ARR forward as an (N, periods + 1, M) companies x periods x scenarios cube.
+
+    Period 0 is today. Headcount compounds at each company's annual
+    ``fte_growth`` (length N, or a scalar) and every ARR-per-FTE value at
+    the annual ``arr_per_fte_drift``; ``arr_per_fte`` is a length-M vector
+    or an (N, M) matrix as in compute_arr(). One broadcast, no loops.
+    """
+    years = np.arange(periods + 1, dtype=np.float64) / periods_per_year
+    fte = np.asarray(fte, dtype=np.float64)
+    growth = np.broadcast_to(np.asarray(fte_growth, dtype=np.float64), fte.shape)
+    if np.any(growth <= -1):
+        raise ValueError("fte_growth must be greater than -1 (-100%)")
+    headcount = fte[:, np.newaxis] * (1 + growth[:, np.newaxis]) ** years
+    drift = (1 + float(arr_per_fte_drift)) ** years
+    arr_per_fte = np.asarray(arr_per_fte, dtype=np.float64)
+    if arr_per_fte.ndim == 1:
+        arr_per_fte = arr_per_fte[np.newaxis, :]
+    return (headcount * drift)[:, :, np.newaxis] * arr_per_fte[:, np.newaxis, :]
+
+
+def _block_mean(values, n_blocks, axis):
+    size = values.shape[axis]
+    starts = np.unique(np.linspace(0, size, min(n_blocks, size) + 1).astype(np.int64)[:-1])
+    counts = np.diff(np.append(starts, size))
+    shape = [1] * values.ndim
+    shape[axis] = counts.size
+    return np.add.reduceat(values, starts, axis=axis) / counts.reshape(shape)
+
+
+def downsample(grid, rows, cols):
+    """Average a 2D grid down to at most (rows, cols) cells."""
+    return _block_mean(_block_mean(np.asarray(grid, dtype=np.float64), rows, 0), cols, 1)
+
+
+def downsample_axis(values, n):
+    """Average 1D axis values into the same blocks downsample() uses."""
+    return _block_mean(np.asarray(values, dtype=np.float64), n, 0)
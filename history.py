@@ -0,0 +1,185 @@
+"""Headcount history store and ARR trajectories.
+
+Snapshots form a dense T x N float64 matrix, one column per company and one
+row per snapshot date. Rows are appended to a raw binary file, so adding a
+week never rewrites earlier weeks; only a snapshot that introduces new
+companies widens (rewrites) the matrix. Missing headcounts are NaN.
+
+Store layout::
+
+    companies.json   column order
+    dates.i8         int64 days since epoch, one per row
+    values.f8        row-major float64 headcounts
+
+Ingest a long-format CSV (date, name, fte) with ``python history.py ingest FILE``.
+"""
+import argparse
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DIR = Path(__file__).parent / "data" / "history"
+
+
+def history_dir():
+    """Directory of the headcount store, overridable with ACRYL_HISTORY."""
+    return Path(os.environ.get("ACRYL_HISTORY", DEFAULT_DIR))
+
+
+class HeadcountHistory:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.companies = []
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.values = np.empty((0, 0), dtype=np.float64)
+        self.refresh()
+
+    @property
+    def n_periods(self):
+        return len(self.dates)
+
+    def column(self, company):
+        return self.companies.index(company)
+
+    def refresh(self):
+        """Pick up rows appended since the last load; only new bytes are read.
+
+        Returns the number of new periods.
+        """
+        meta = self.path / "companies.json"
+        if not meta.exists():
+            return 0
+        companies = json.loads(meta.read_text())
+        if companies != self.companies:
+            # Widened by another writer: reload everything
+            self.companies = companies
+            self.dates = np.empty(0, dtype="datetime64[D]")
+            self.values = np.empty((0, len(companies)), dtype=np.float64)
+
+        width = len(self.companies)
+        known = self.n_periods
+        n_values = os.path.getsize(self.path / "values.f8") // 8
+        # Values are written before dates, so a torn append never shows a row without a date
+        total = min(os.path.getsize(self.path / "dates.i8") // 8, n_values // width if width else 0)
+        if total <= known:
+            return 0
+
+        new_dates = np.fromfile(self.path / "dates.i8", dtype=np.int64, count=total - known, offset=known * 8)
+        new_values = np.fromfile(self.path / "values.f8", dtype=np.float64, count=(total - known) * width, offset=known * width * 8)
+        self.dates = np.concatenate([self.dates, new_dates.astype("datetime64[D]")])
+        self.values = np.vstack([self.values, new_values.reshape(-1, width)])
+        return total - known
+
+    def append(self, date, fte_by_company):
+        """Append one snapshot. ``fte_by_company`` maps company name to FTE."""
+        date = np.datetime64(date, "D")
+        if self.n_periods and date <= self.dates[-1]:
+            raise ValueError(f"Snapshot {date} is not after the latest snapshot {self.dates[-1]}")
+
+        new = [company for company in fte_by_company if company not in self.companies]
+        if new:
+            self._widen(new)
+
+        row = np.full(len(self.companies), np.nan)
+        index = {company: i for i, company in enumerate(self.companies)}
+        for company, fte in fte_by_company.items():
+            row[index[company]] = fte
+
+        with open(self.path / "values.f8", "ab") as f:
+            f.write(row.tobytes())
+        with open(self.path / "dates.i8", "ab") as f:
+            f.write(np.int64(date.astype(np.int64)).tobytes())
+        self.dates = np.append(self.dates, date)
+        self.values = np.vstack([self.values, row])
+
+    def ingest(self, frame):
+        """Append every snapshot in a long (date, name, fte) frame newer than the store.
+
+        Returns the number of periods appended.
+        """
+        frame = frame.assign(date=pd.to_datetime(frame["date"]).dt.floor("D"))
+        if self.n_periods:
+            frame = frame[frame["date"] > pd.Timestamp(self.dates[-1])]
+        wide = frame.pivot_table(index="date", columns="name", values="fte", aggfunc="last").sort_index()
+        for date, row in wide.iterrows():
+            self.append(date.to_datetime64(), row.dropna().to_dict())
+        return len(wide)
+
+    def frame(self):
+        return pd.DataFrame(self.values, index=pd.DatetimeIndex(self.dates, name="date"), columns=self.companies)
+
+    def _widen(self, new_companies):
+        self.path.mkdir(parents=True, exist_ok=True)
+        companies = self.companies + list(new_companies)
+        values = np.hstack([self.values, np.full((self.n_periods, len(new_companies)), np.nan)])
+
+        tmp = self.path / "values.f8.tmp"
+        values.tofile(tmp)
+        os.replace(tmp, self.path / "values.f8")
+        if not (self.path / "dates.i8").exists():
+            (self.path / "dates.i8").touch()
+        (self.path / "companies.json").write_text(json.dumps(companies))
+        self.companies = companies
+        self.values = values
+
+
+def arr_trajectories(fte_history, arr_per_fte):
+    """(T, N, M) ARR for T periods of N headcounts under M ARR-per-FTE values.
+
+    ``arr_per_fte`` is a length-M vector or an (N, M) per-company matrix.
+    """
+    return np.asarray(fte_history, dtype=np.float64)[:, :, np.newaxis] * np.asarray(arr_per_fte, dtype=np.float64)
+
+
+class TrajectoryCache:
+    """ARR trajectories per (columns, scenario matrix), extended as periods arrive.
+
+    When the history grows from T to T + k periods, only the k new rows are
+    computed and appended to the cached trajectories.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, history, columns, arr_per_fte):
+        columns = np.asarray(columns, dtype=np.int64)
+        arr_per_fte = np.asarray(arr_per_fte, dtype=np.float64)
+        key = (str(history.path), tuple(history.companies[i] for i in columns), arr_per_fte.shape, arr_per_fte.tobytes())
+
+        cached = self._entries.pop(key, None)
+        if cached is None or cached.shape[0] > history.n_periods:
+            cached = arr_trajectories(history.values[:, columns], arr_per_fte)
+        elif cached.shape[0] < history.n_periods:
+            fresh = arr_trajectories(history.values[cached.shape[0]:, columns], arr_per_fte)
+            cached = np.concatenate([cached, fresh])
+
+        self._entries[key] = cached
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return cached
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the headcount history store.")
+    parser.add_argument("--store", type=Path, default=None, help="store directory (default: $ACRYL_HISTORY or data/history)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="append snapshots from a long-format CSV/Parquet (date, name, fte)")
+    ingest.add_argument("file", type=Path)
+    args = parser.parse_args(argv)
+
+    history = HeadcountHistory(args.store or history_dir())
+    if args.file.suffix.lower() in (".parquet", ".pq"):
+        frame = pd.read_parquet(args.file)
+    else:
+        frame = pd.read_csv(args.file)
+    added = history.ingest(frame)
+    print(f"Appended {added} snapshot(s); store now holds {history.n_periods} periods x {len(history.companies)} companies")
+
+
+if __name__ == "__main__":
+    main()
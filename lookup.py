@@ -0,0 +1,131 @@
+"""Precomputed ARR lookup table over the quantized slider space.
+
+Every ARR-per-FTE slider moves in 10,000 steps between 50,000 and 300,000,
+so the dashboard can only ever ask for 26 distinct values. ``build`` writes
+each company's ARR at every step to a raw S x N float64 file (one row per
+step, so one scenario is one contiguous row); the dashboard memory-maps it
+and a rerun reads rows instead of recomputing. Float64 keeps the numbers
+bit-identical to ``compute_arr``.
+
+Tables are named after the company file's content hash, so an edited file
+simply has no table until it is rebuilt, and the app falls back to
+computing. Store layout::
+
+    <digest>.f8     row-major float64 ARR, steps x companies
+    <digest>.json   step grid and company count, written last
+
+Build one with ``python lookup.py build``.
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from companies import companies_path, file_digest, read_companies
+
+DEFAULT_DIR = Path(__file__).parent / "data" / "lookup"
+
+# (start, inclusive stop, step) covering every ARR-per-FTE slider's bounds
+STEP_RANGE = (50000, 300000, 10000)
+
+
+def lookup_dir():
+    """Directory of the lookup tables, overridable with ACRYL_LOOKUP."""
+    return Path(os.environ.get("ACRYL_LOOKUP", DEFAULT_DIR))
+
+
+def step_values(step_range=STEP_RANGE):
+    start, stop, step = step_range
+    return np.arange(start, stop + step, step, dtype=np.float64)
+
+
+def build(table, digest, directory, step_range=STEP_RANGE, chunk_size=1 << 20):
+    """Write the lookup table for ``table`` and return its path.
+
+    Rows are filled straight into the memory-mapped file, ``chunk_size``
+    companies at a time, so the full table never sits in memory.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    steps = step_values(step_range)
+    fte = table["fte"].to_numpy(dtype=np.float64)
+
+    tmp = directory / f"{digest}.f8.tmp"
+    out = np.memmap(tmp, dtype=np.float64, mode="w+", shape=(len(steps), len(fte)))
+    for start in range(0, len(fte), chunk_size):
+        out[:, start:start + chunk_size] = np.multiply.outer(steps, fte[start:start + chunk_size])
+    out.flush()
+    del out
+    os.replace(tmp, directory / f"{digest}.f8")
+    # Metadata last: a table without it is never opened
+    (directory / f"{digest}.json").write_text(json.dumps({"steps": list(step_range), "companies": len(fte)}))
+    return directory / f"{digest}.f8"
+
+
+class ArrLookup:
+    def __init__(self, path, step_range, n_companies):
+        self.path = Path(path)
+        self.step_range = tuple(step_range)
+        self.n_steps = len(step_values(self.step_range))
+        self.arr = np.memmap(self.path, dtype=np.float64, mode="r", shape=(self.n_steps, n_companies))
+
+    @classmethod
+    def open(cls, directory, digest, n_companies):
+        """Map the table for ``digest``, or return None if there is no usable one."""
+        directory = Path(directory)
+        meta = directory / f"{digest}.json"
+        if not meta.exists():
+            return None
+        meta = json.loads(meta.read_text())
+        path = directory / f"{digest}.f8"
+        n_steps = len(step_values(meta["steps"]))
+        if meta["companies"] != n_companies or os.path.getsize(path) != n_steps * n_companies * 8:
+            return None
+        return cls(path, meta["steps"], n_companies)
+
+    def step_index(self, values):
+        """Row of each ARR-per-FTE value, or None if any is off the step grid."""
+        start, stop, step = self.step_range
+        values = np.asarray(values, dtype=np.float64)
+        index = (values - start) / step
+        rows = np.rint(index).astype(np.int64)
+        if not (np.all(index == rows) and np.all((rows >= 0) & (rows < self.n_steps))):
+            return None
+        return rows
+
+    def scenario_arr(self, scenario_values, overrides=()):
+        """(M + 1, N) ARR for M shared values and a custom column, like ``scenario_matrix``.
+
+        ``overrides`` holds (company position, ARR per FTE) pairs; other
+        companies' custom value is the second scenario value (the base case).
+        Returns None when a value is off the step grid.
+        """
+        positions = [position for position, _ in overrides]
+        rows = self.step_index(list(scenario_values) + [value for _, value in overrides])
+        if rows is None:
+            return None
+        n_shared = len(scenario_values)
+        arr = np.asarray(self.arr[np.append(rows[:n_shared], rows[1])])
+        if positions:
+            arr[-1, positions] = self.arr[rows[n_shared:], positions]
+        return arr
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute ARR at every slider step.")
+    parser.add_argument("--store", type=Path, default=None, help="table directory (default: $ACRYL_LOOKUP or data/lookup)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_cmd = commands.add_parser("build", help="build the table for a company file")
+    build_cmd.add_argument("--companies", type=Path, default=None, help="competitor CSV/Parquet (default: $ACRYL_COMPANIES or data/companies.csv)")
+    args = parser.parse_args(argv)
+
+    path = args.companies or companies_path()
+    table = read_companies(path)
+    out = build(table, file_digest(path), args.store or lookup_dir())
+    print(f"Wrote {out} ({len(step_values())} steps x {len(table)} companies, {os.path.getsize(out) / 1e6:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Monte Carlo ARR-per-FTE distributions.
+
+Draws are generated in seeded chunks and folded into a fixed-edge histogram,
+so memory stays bounded by the chunk size regardless of the number of draws.
+Every company shares the same ARR-per-FTE (and FTE uncertainty) distribution,
+so a company's ARR distribution is its FTE times the simulated per-FTE
+multiplier: one simulation serves the whole competitor universe exactly.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+DISTRIBUTIONS = ("Triangular", "Lognormal", "Uniform")
+
+# z-score of the 90th percentile; bear/bull are read as P10/P90 for the lognormal
+Z90 = 1.2815515655446004
+
+
+class Distribution(NamedTuple):
+    edges: np.ndarray   # (bins + 1,) bin edges in $ ARR per nominal FTE
+    counts: np.ndarray  # (bins,) draw counts per bin
+    mean: float
+
+
+def _support(distribution, low, mode, high):
+    if distribution == "Lognormal":
+        mu = np.log(mode)
+        sigma = max(np.log(high / low) / (2 * Z90), 1e-9)
+        return np.exp(mu - 4 * sigma), np.exp(mu + 4 * sigma)
+    return low, high
+
+
+def _draw(rng, distribution, low, mode, high, size):
+    if high <= low:
+        return np.full(size, float(mode))
+    if distribution == "Triangular":
+        return rng.triangular(low, mode, high, size)
+    if distribution == "Lognormal":
+        sigma = np.log(high / low) / (2 * Z90)
+        return rng.lognormal(np.log(mode), sigma, size)
+    if distribution == "Uniform":
+        return rng.uniform(low, high, size)
+    raise ValueError(f"Unknown distribution {distribution!r}; expected one of {DISTRIBUTIONS}")
+
+
+def simulate(distribution, bear, base, bull, fte_spread=0.0, draws=1_000_000, seed=0,
+             chunk_size=250_000, bins=1200):
+    """Simulate the ARR-per-FTE multiplier and return its histogram.
+
+    Bear/base/bull parametrize the distribution (min/mode/max for triangular,
+    P10/median/P90 for lognormal, min/max for uniform). ``fte_spread`` is the
+    relative standard deviation of a normal FTE uncertainty factor.
+    """
+    low, mode, high = sorted((float(bear), float(base), float(bull)))
+    lo, hi = _support(distribution, low, mode, high)
+    if fte_spread > 0:
+        lo *= max(0.0, 1 - 4 * fte_spread)
+        hi *= 1 + 4 * fte_spread
+    if hi <= lo:
+        lo, hi = lo - 1, hi + 1
+    edges = np.linspace(lo, hi, bins + 1)
+    scale = bins / (hi - lo)
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(bins, dtype=np.int64)
+    total = 0.0
+    for start in range(0, draws, chunk_size):
+        size = min(chunk_size, draws - start)
+        x = _draw(rng, distribution, low, mode, high, size)
+        if fte_spread > 0:
+            x *= np.maximum(rng.normal(1.0, fte_spread, size), 0.0)
+        total += x.sum()
+        idx = np.clip(((x - lo) * scale).astype(np.int64), 0, bins - 1)
+        counts += np.bincount(idx, minlength=bins)
+    return Distribution(edges, counts, total / draws)
+
+
+def quantiles(dist, qs):
+    """Quantiles of a simulated distribution, interpolated within bins."""
+    qs = np.asarray(qs, dtype=np.float64)
+    cdf = np.cumsum(dist.counts) / dist.counts.sum()
+    i = np.minimum(np.searchsorted(cdf, qs), len(dist.counts) - 1)
+    below = np.where(i > 0, cdf[i - 1], 0.0)
+    width = cdf[i] - below
+    frac = np.divide(qs - below, width, out=np.zeros_like(qs), where=width > 0)
+    return dist.edges[i] + frac * (dist.edges[i + 1] - dist.edges[i])
+
+
+def company_bands(fte, dist, qs=(0.1, 0.5, 0.9)):
+    """(N, len(qs)) ARR quantiles for N companies."""
+    return np.asarray(fte, dtype=np.float64)[:, np.newaxis] * quantiles(dist, qs)
+
+
+def coarsen(dist, n_bins):
+    """Merge histogram bins down to at most ``n_bins`` for display.
+
+    Returns (left_edges, right_edges, density) where density sums to 1.
+    """
+    starts = np.unique(np.linspace(0, len(dist.counts), n_bins + 1).astype(np.int64)[:-1])
+    counts = np.add.reduceat(dist.counts, starts)
+    stops = np.append(starts[1:], len(dist.counts))
+    return dist.edges[starts], dist.edges[stops], counts / counts.sum()
@@ -0,0 +1,114 @@
+"""Per-rerun byte budget for chart data.
+
+Every chart spec sent during a run is charged to the run's budget by its
+serialized size. Charts whose data can be aggregated (sweeps, heatmaps,
+histograms, trajectories) ask :func:`rows` how many rows still fit before
+building, and get a coarser resolution once earlier charts have used up
+the budget. Fragment reruns get a budget of their own through
+:func:`scoped`, like profiling's fragment runs.
+
+The limit is ``ACRYL_CHART_BUDGET_KB`` (default 512 KB per run). Each
+chart is also held to ``ACRYL_CHART_MAX_ROWS`` rows (default 5,000, the
+same as Altair's inline data guard), whatever budget is left. Charts whose
+rows grow with the tracked companies send them as named datasets, which
+Altair does not check, so this cap is the one that applies.
+
+A chart is sent as one element: when any of its values change (a marker
+moved by a slider), the whole element is sent again, so the budget
+bounds those re-sends rather than avoiding them.
+"""
+import functools
+import json
+import os
+import threading
+
+DEFAULT_KB = 512
+DEFAULT_MAX_ROWS = 5000
+
+_local = threading.local()
+
+
+class Budget:
+    def __init__(self, limit, max_rows):
+        self.limit = limit
+        self.max_rows = max_rows
+        self.used = 0
+        self.aggregated = []
+
+    def rows(self, name, wanted, row_bytes, minimum):
+        remaining = max(self.limit - self.used, 0)
+        allowed = max(minimum, min(remaining // row_bytes, self.max_rows))
+        if allowed < wanted:
+            self.aggregated.append(name)
+            return allowed
+        return wanted
+
+    def charge(self, spec):
+        self.used += spec_bytes(spec)
+
+
+def limit_bytes():
+    return int(float(os.environ.get("ACRYL_CHART_BUDGET_KB", DEFAULT_KB)) * 1024)
+
+
+def max_rows():
+    return int(os.environ.get("ACRYL_CHART_MAX_ROWS", DEFAULT_MAX_ROWS))
+
+
+def spec_bytes(spec):
+    """Approximate bytes a spec puts on the wire: the spec as compact JSON plus its datasets."""
+    body = {key: value for key, value in spec.items() if key != "datasets"}
+    return len(json.dumps(body, separators=(",", ":"))) + sum(map(_dataset_bytes, spec.get("datasets", {}).values()))
+
+
+def _dataset_bytes(rows):
+    if hasattr(rows, "memory_usage"):
+        # Frames go out as Arrow, about the size of their columns in memory
+        return int(rows.memory_usage(index=False).sum())
+    return len(json.dumps(rows, separators=(",", ":")))
+
+
+def begin():
+    _local.budget = Budget(limit_bytes(), max_rows())
+
+
+def finish():
+    """Close the run's budget. Returns its used bytes, limit and aggregated charts, or None."""
+    budget = getattr(_local, "budget", None)
+    _local.budget = None
+    if budget is None:
+        return None
+    return {"used": budget.used, "limit": budget.limit, "aggregated": budget.aggregated}
+
+
+def _current():
+    budget = getattr(_local, "budget", None)
+    # Outside a run's budget (an unscoped fragment rerun) only the row cap applies
+    return budget if budget is not None else Budget(float("inf"), max_rows())
+
+
+def rows(name, wanted, row_bytes, minimum=2):
+    """How many of ``wanted`` rows of ~``row_bytes`` each chart ``name`` may send.
+
+    At most the per-chart row cap and never fewer than ``minimum``; charts
+    given fewer than they wanted are listed as aggregated in the run's summary.
+    """
+    return _current().rows(name, wanted, row_bytes, minimum)
+
+
+def charge(spec):
+    _current().charge(spec)
+
+
+def scoped(func):
+    """Give a fragment's own reruns a fresh budget; inside a full run it shares the run's."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, "budget", None) is not None:
+            return func(*args, **kwargs)
+        begin()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            finish()
+    return wrapper
@@ -0,0 +1,204 @@
+"""Opt-in per-rerun instrumentation for the dashboard.
+
+Enabled with the ``?profile=1`` query parameter or ``ACRYL_PROFILE=1``.
+While enabled, each script run (or fragment rerun) records:
+
+- wall time per named section, exclusive of nested sections, so the
+  section times add up to the run total,
+- serialized bytes and element count of every message the run sends to
+  the browser, attributed to the section that produced it and broken down
+  by element type (markdown, arrow_data_frame, arrow_vega_lite_chart, ...).
+
+Each finished run is logged as one JSON line on the ``acryl.profile`` logger
+and kept in a rolling per-session history for the debug panel.
+
+Message sizes come from wrapping the script run context's enqueue hook,
+so they are the protobuf bytes actually put on the websocket.
+"""
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+HISTORY_LENGTH = 20
+TRUTHY = ("1", "true", "yes", "on")
+
+logger = logging.getLogger("acryl.profile")
+_local = threading.local()
+
+
+def enabled():
+    if os.environ.get("ACRYL_PROFILE", "").lower() in TRUTHY:
+        return True
+    return st.query_params.get("profile", "").lower() in TRUTHY
+
+
+class RunProfile:
+    def __init__(self, run, section):
+        self.run = run
+        self.started = time.perf_counter()
+        self.sections = {}
+        self.payload = {}
+        self._stack = [section]
+        self._mark = self.started
+
+    def _section(self, name):
+        return self.sections.setdefault(name, {"ms": 0.0, "bytes": 0, "elements": 0})
+
+    def _charge(self):
+        now = time.perf_counter()
+        self._section(self._stack[-1])["ms"] += (now - self._mark) * 1000
+        self._mark = now
+
+    def enter(self, name):
+        self._charge()
+        self._stack.append(name)
+
+    def exit(self):
+        self._charge()
+        self._stack.pop()
+
+    def mark(self, name):
+        self._charge()
+        self._stack[-1] = name
+
+    def record(self, msg):
+        size = msg.ByteSize()
+        kind = msg.WhichOneof("type")
+        if kind == "delta":
+            kind = msg.delta.WhichOneof("type")
+            if kind == "new_element":
+                kind = msg.delta.new_element.WhichOneof("type")
+        section = self._section(self._stack[-1])
+        section["bytes"] += size
+        section["elements"] += 1
+        self.payload[kind] = self.payload.get(kind, 0) + size
+
+    def summary(self):
+        self._charge()
+        sections = [
+            {"section": name, "ms": round(data["ms"], 2), "bytes": data["bytes"], "elements": data["elements"]}
+            for name, data in self.sections.items()
+        ]
+        return {
+            "run": self.run,
+            "ms": round((self._mark - self.started) * 1000, 2),
+            "bytes": sum(data["bytes"] for data in self.sections.values()),
+            "sections": sections,
+            "payload": dict(sorted(self.payload.items(), key=lambda item: item[1], reverse=True)),
+        }
+
+
+def _install_hook():
+    # Wrap the session's enqueue once; it charges each outgoing message to the active profile
+    from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None or getattr(ctx, "_acryl_profiled", False) or not hasattr(ctx, "_enqueue"):
+        return
+    forward = ctx._enqueue
+
+    def enqueue(msg):
+        profile = getattr(_local, "profile", None)
+        if profile is not None:
+            profile.record(msg)
+        forward(msg)
+
+    ctx._enqueue = enqueue
+    ctx._acryl_profiled = True
+
+
+def _configure_logger():
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def begin(run="script", section="(unsectioned)"):
+    """Start profiling this run if instrumentation is enabled. Returns whether it is.
+
+    Time and output before the first section or mark are charged to ``section``.
+    """
+    _local.profile = None
+    if not enabled():
+        return False
+    _configure_logger()
+    _install_hook()
+    _local.profile = RunProfile(run, section)
+    return True
+
+
+def finish(**extra):
+    """Close the active profile, log it and add it to the session history.
+
+    ``extra`` fields are added to the summary. Returns the summary, or None
+    when profiling is off.
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return None
+    _local.profile = None
+    summary = dict(profile.summary(), **extra)
+    logger.info(json.dumps(summary))
+    history().append(summary)
+    return summary
+
+
+def history():
+    return st.session_state.setdefault("profile_history", deque(maxlen=HISTORY_LENGTH))
+
+
+@contextmanager
+def section(name):
+    """Time a block and charge its output to ``name``.
+
+    Outside a profiled run (a fragment rerun) the outermost section
+    profiles itself as a run of its own.
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        if not begin(run=name, section=name):
+            yield
+            return
+        try:
+            yield
+        finally:
+            finish()
+        return
+    profile.enter(name)
+    try:
+        yield
+    finally:
+        profile.exit()
+
+
+def mark(name):
+    """Charge everything from here to the next mark to ``name``.
+
+    For straight-line top-level script code, where a ``with`` block would
+    re-indent the whole section.
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is not None:
+        profile.mark(name)
+
+
+def timed(name):
+    """Decorator running the whole function as a :func:`section`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,189 @@
+"""Static PNG/PDF reports rendered with matplotlib in worker processes.
+
+A report covers the dashboard's three views for a set of companies:
+Summary (ARR per scenario), Detailed (ARR estimates and ARR per FTE
+table) and Sensitivity (ARR across the ARR-per-FTE sweep with the
+scenario markers). PDFs get one page per view, PNGs one tall figure.
+
+Jobs are plain tuples, so they pickle cheaply into a process pool; each
+worker imports matplotlib with the non-interactive Agg backend once and
+renders jobs until the pool is drained. Neither the dashboard nor this
+module imports matplotlib in the calling process.
+
+    python reports.py -o reports --format pdf --workers 8
+    python reports.py --company Collibra --company Alation --format png
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from companies import companies_path, read_companies
+from engine import KEY_VALUES, SCENARIOS, SENSITIVITY_RANGE, compute_arr, scenario_matrix
+
+DEFAULT_DIR = Path(__file__).parent / "data" / "reports"
+
+FORMATS = ("pdf", "png")
+SCENARIO_COLORS = ("#F87171", "#4ADE80", "#60A5FA", "#A78BFA")
+
+
+def reports_dir():
+    """Directory reports are written to, overridable with ACRYL_REPORTS."""
+    return Path(os.environ.get("ACRYL_REPORTS", DEFAULT_DIR))
+
+
+class ReportJob(NamedTuple):
+    title: str
+    companies: tuple      # company names
+    fte: tuple
+    colors: tuple
+    scenario_values: tuple  # bear, base, bull ARR per FTE
+    custom: tuple         # per-company custom ARR per FTE
+    path: str
+    fmt: str = "pdf"
+
+
+def report_filename(company, fmt):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", company).strip("_") + f".{fmt}"
+
+
+def company_jobs(table, scenario_values, directory, fmt="pdf", custom=None):
+    """One single-company job per row of ``table``.
+
+    ``custom`` maps company names to custom ARR per FTE; others use the base case.
+    """
+    custom = custom or {}
+    base = scenario_values[1]
+    return [
+        ReportJob(row.Index, (row.Index,), (row.fte,), (row.color,), tuple(scenario_values),
+                  (custom.get(row.Index, base),), str(Path(directory) / report_filename(row.Index, fmt)), fmt)
+        for row in table.itertuples()
+    ]
+
+
+_pyplot = None
+
+
+def _plt():
+    # Imported once per worker process
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot
+        _pyplot = matplotlib.pyplot
+    return _pyplot
+
+
+def _summary(ax, job, arr_m):
+    n, m = arr_m.shape
+    width = 0.8 / m
+    x = np.arange(n)
+    for j, (scenario, color) in enumerate(zip(SCENARIOS, SCENARIO_COLORS)):
+        ax.bar(x + (j - (m - 1) / 2) * width, arr_m[:, j], width, label=scenario, color=color)
+    ax.set_xticks(x, job.companies, rotation=30 if n > 4 else 0, ha="right" if n > 4 else "center")
+    ax.set_ylabel("ARR ($ Millions)")
+    ax.set_title("Summary: ARR by Scenario")
+    ax.legend(frameon=False, ncols=m)
+
+
+def _detailed(ax, job, arr_m, arr_per_fte):
+    ax.axis("off")
+    ax.set_title("Detailed: ARR Estimates ($ millions)")
+    rows = [
+        [company, f"{fte:,.0f}"] + [f"${value:,.1f}M" for value in arr] + [f"${custom/1000:,.0f}K"]
+        for company, fte, arr, custom in zip(job.companies, job.fte, arr_m, arr_per_fte[:, -1])
+    ]
+    table = ax.table(cellText=rows, colLabels=["Company", "FTE"] + list(SCENARIOS) + ["Custom ARR/FTE"], loc="upper center")
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+    table.scale(1, 1.4)
+
+
+def _sensitivity(ax, job):
+    sweep = np.arange(*SENSITIVITY_RANGE, dtype=np.float64)
+    arr_m = compute_arr(job.fte, sweep) / 1000000
+    for company, color, line in zip(job.companies, job.colors, arr_m):
+        ax.plot(sweep / 1000, line, color=color, label=company)
+    for value, color in zip(job.scenario_values, SCENARIO_COLORS):
+        ax.axvline(value / 1000, color=color, linestyle="--", linewidth=1)
+    key_values = np.asarray(KEY_VALUES, dtype=np.float64)
+    ax.scatter(np.tile(key_values / 1000, len(job.fte)), (compute_arr(job.fte, key_values) / 1000000).ravel(),
+               s=12, color="#6B7280", zorder=3)
+    ax.set_xlabel("ARR per FTE ($K)")
+    ax.set_ylabel("ARR ($ Millions)")
+    ax.set_title("Sensitivity: ARR across ARR per FTE")
+    if len(job.companies) <= 12:
+        ax.legend(frameon=False)
+
+
+def render(job):
+    """Render one report and return its path. Runs in a worker process."""
+    plt = _plt()
+    arr_per_fte = scenario_matrix(job.scenario_values, job.custom, job.scenario_values[1])
+    arr_m = compute_arr(job.fte, arr_per_fte) / 1000000
+    path = Path(job.path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if job.fmt == "pdf":
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        with PdfPages(path) as pdf:
+            for draw in (lambda ax: _summary(ax, job, arr_m), lambda ax: _detailed(ax, job, arr_m, arr_per_fte), lambda ax: _sensitivity(ax, job)):
+                fig, ax = plt.subplots(figsize=(11, 8.5))
+                fig.suptitle(job.title, fontsize=14)
+                draw(ax)
+                pdf.savefig(fig)
+                plt.close(fig)
+    elif job.fmt == "png":
+        fig, (summary, detailed, sensitivity) = plt.subplots(3, 1, figsize=(11, 18), height_ratios=(3, 2, 3))
+        fig.suptitle(job.title, fontsize=14)
+        _summary(summary, job, arr_m)
+        _detailed(detailed, job, arr_m, arr_per_fte)
+        _sensitivity(sensitivity, job)
+        fig.tight_layout()
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
+    else:
+        raise ValueError(f"Unknown report format {job.fmt!r}; expected one of {FORMATS}")
+    return str(path)
+
+
+def report_pool(workers=None):
+    """Process pool for ``render``; spawned so workers never inherit a server's threads."""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render static ARR reports, one per company.")
+    parser.add_argument("--companies", type=Path, default=None, help="competitor CSV/Parquet (default: $ACRYL_COMPANIES or data/companies.csv)")
+    parser.add_argument("--company", action="append", default=[], help="only these companies (repeatable; default: every company)")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="report directory (default: $ACRYL_REPORTS or data/reports)")
+    parser.add_argument("--format", choices=FORMATS, default="pdf")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--bear", type=float, default=90000)
+    parser.add_argument("--base", type=float, default=150000)
+    parser.add_argument("--bull", type=float, default=250000)
+    args = parser.parse_args(argv)
+
+    table = read_companies(args.companies or companies_path())
+    if args.company:
+        unknown = sorted(set(args.company) - set(table.index))
+        if unknown:
+            parser.error(f"unknown company: {', '.join(unknown)}")
+        table = table.loc[args.company]
+    jobs = company_jobs(table, (args.bear, args.base, args.bull), args.output or reports_dir(), args.format)
+
+    with report_pool(args.workers) as pool:
+        for done, future in enumerate(as_completed([pool.submit(render, job) for job in jobs]), 1):
+            print(f"[{done}/{len(jobs)}] {future.result()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Saved scenarios in a local SQLite database.
+
+A scenario is a name, the bear/base/bull ARR per FTE, the tracked
+companies in order and their custom overrides. Settings live in one row
+per scenario and companies in one row per (scenario, company), indexed by
+company so "which scenarios track X" is an index lookup. Writes are batched
+into one transaction per call; the database runs in WAL mode so the
+dashboard keeps reading while an import writes.
+
+``compare`` diffs one scenario against every saved one at once: all saved
+settings are loaded as columns, company sets become a membership matrix,
+and each scenario's assumptions are evaluated on the reference companies
+in a single broadcast.
+
+    python scenario_store.py import scenarios.jsonl
+    python scenario_store.py list
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATH = Path(__file__).parent / "data" / "scenarios.sqlite"
+
+# ARR per FTE the dashboard's sliders can show; saved values must fall inside it
+VALUE_RANGE = (50000, 300000)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    saved_at TEXT NOT NULL,
+    bear REAL NOT NULL,
+    base REAL NOT NULL,
+    bull REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_saved_at ON scenarios (saved_at);
+CREATE TABLE IF NOT EXISTS scenario_companies (
+    scenario_id INTEGER NOT NULL REFERENCES scenarios (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    company TEXT NOT NULL,
+    custom REAL,
+    PRIMARY KEY (scenario_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scenario_companies_company ON scenario_companies (company, scenario_id);
+"""
+
+
+def validate(scenario):
+    """Raise ValueError if any of ``scenario``'s ARR per FTE values is outside VALUE_RANGE."""
+    low, high = VALUE_RANGE
+    values = [("bear", scenario.bear), ("base", scenario.base), ("bull", scenario.bull)]
+    values += [(f"custom value for {company}", value) for company, value in (scenario.custom or {}).items()]
+    for label, value in values:
+        if not low <= float(value) <= high:
+            raise ValueError(f"Scenario {scenario.name!r}: {label} {value} is outside {low:,}-{high:,}")
+
+
+def store_path():
+    """Path of the scenario database, overridable with ACRYL_SCENARIOS."""
+    return Path(os.environ.get("ACRYL_SCENARIOS", DEFAULT_PATH))
+
+
+class Scenario(NamedTuple):
+    name: str
+    bear: float
+    base: float
+    bull: float
+    tracked: tuple        # company names, in display order
+    custom: dict = None   # company -> custom ARR per FTE; others follow the base case
+
+
+class ScenarioStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the app's script threads, serialized by the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._frames = None
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+
+    def save(self, scenario):
+        self.save_many([scenario])
+
+    def save_many(self, scenarios):
+        """Insert or replace scenarios by name in one transaction. Returns the count.
+
+        Nothing is written if any scenario fails :func:`validate`.
+        """
+        saved_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        # The last scenario with a given name wins; a missing custom mapping means no overrides
+        scenarios = [s._replace(custom=dict(s.custom or {})) for s in {s.name: s for s in scenarios}.values()]
+        for scenario in scenarios:
+            validate(scenario)
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM scenarios WHERE name = ?", [(s.name,) for s in scenarios])
+            ids = [
+                self._conn.execute("INSERT INTO scenarios (name, saved_at, bear, base, bull) VALUES (?, ?, ?, ?, ?)",
+                                   (s.name, saved_at, float(s.bear), float(s.base), float(s.bull))).lastrowid
+                for s in scenarios
+            ]
+            self._conn.executemany(
+                "INSERT INTO scenario_companies (scenario_id, position, company, custom) VALUES (?, ?, ?, ?)",
+                [(scenario_id, position, company, s.custom.get(company))
+                 for scenario_id, s in zip(ids, scenarios) for position, company in enumerate(s.tracked)]
+            )
+        return len(scenarios)
+
+    def delete(self, name):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scenarios WHERE name = ?", (name,))
+
+    def names(self):
+        """Saved scenario names, newest first."""
+        with self._lock:
+            return [name for (name,) in self._conn.execute("SELECT name FROM scenarios ORDER BY saved_at DESC, id DESC")]
+
+    def load(self, name):
+        with self._lock:
+            row = self._conn.execute("SELECT id, bear, base, bull FROM scenarios WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise KeyError(name)
+            members = self._conn.execute(
+                "SELECT company, custom FROM scenario_companies WHERE scenario_id = ? ORDER BY position", (row[0],)
+            ).fetchall()
+        return Scenario(name, row[1], row[2], row[3], tuple(company for company, _ in members),
+                        {company: custom for company, custom in members if custom is not None})
+
+    def frames(self):
+        """All saved settings (indexed by id) and company rows, as two frames.
+
+        Re-read only after a write by this or another connection.
+        """
+        with self._lock:
+            version = (self._conn.execute("PRAGMA data_version").fetchone()[0], self._conn.total_changes)
+            if self._frames is None or self._frames[0] != version:
+                settings = pd.read_sql_query("SELECT id, name, saved_at, bear, base, bull FROM scenarios", self._conn, index_col="id")
+                members = pd.read_sql_query("SELECT scenario_id, company, custom FROM scenario_companies", self._conn)
+                self._frames = (version, settings, members)
+            return self._frames[1], self._frames[2]
+
+
+def compare(reference, settings, members, fte):
+    """Diff ``reference`` against every saved scenario in one pass.
+
+    Each saved scenario's bear/base/bull and custom values are applied to
+    the reference's tracked companies (``fte`` maps company to FTE), so ARR
+    differences come from the assumptions alone; ``added``/``removed``
+    count how the saved company set differs. Returns one row per saved
+    scenario.
+    """
+    ref_companies = list(reference.tracked)
+    companies, codes = np.unique(np.concatenate([ref_companies, members["company"].to_numpy(dtype=str)]), return_inverse=True)
+    ref_codes, member_codes = codes[:len(ref_companies)], codes[len(ref_companies):]
+    rows = settings.index.get_indexer(members["scenario_id"])
+
+    in_saved = np.zeros((len(settings), len(companies)), dtype=bool)
+    in_saved[rows, member_codes] = True
+    in_reference = np.zeros(len(companies), dtype=bool)
+    in_reference[ref_codes] = True
+
+    weights = np.zeros(len(companies))
+    weights[ref_codes] = pd.Series(fte).reindex(ref_companies).fillna(0).to_numpy(dtype=np.float64)
+
+    # Custom ARR per FTE per (saved scenario, company); NaN follows that scenario's base case
+    base = settings["base"].to_numpy(dtype=np.float64)
+    custom = np.full((len(settings), len(companies)), np.nan)
+    custom[rows, member_codes] = members["custom"].to_numpy(dtype=np.float64)
+    custom = np.where(np.isnan(custom), base[:, np.newaxis], custom)
+
+    values = settings[["bear", "base", "bull"]].to_numpy(dtype=np.float64)
+    arr = np.column_stack([values * weights.sum(), custom @ weights])
+
+    ref_overrides = reference.custom or {}
+    ref_custom = np.array([ref_overrides.get(company, reference.base) for company in ref_companies], dtype=np.float64)
+    ref_weights = weights[ref_codes]
+    ref_arr = np.append(np.array([reference.bear, reference.base, reference.bull]) * ref_weights.sum(), ref_custom @ ref_weights)
+
+    delta = arr - ref_arr
+    return pd.DataFrame({
+        "scenario": settings["name"].to_numpy(),
+        "saved_at": settings["saved_at"].to_numpy(),
+        "bear_delta": delta[:, 0],
+        "base_delta": delta[:, 1],
+        "bull_delta": delta[:, 2],
+        "custom_delta": delta[:, 3],
+        "added": (in_saved & ~in_reference).sum(axis=1),
+        "removed": (~in_saved & in_reference).sum(axis=1),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage saved scenarios.")
+    parser.add_argument("--store", type=Path, default=None, help="database (default: $ACRYL_SCENARIOS or data/scenarios.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_cmd = commands.add_parser("import", help="save scenarios from JSON Lines (name, bear, base, bull, tracked, custom)")
+    import_cmd.add_argument("file", type=Path)
+    commands.add_parser("list", help="print saved scenario names, newest first")
+    args = parser.parse_args(argv)
+
+    store = ScenarioStore(args.store or store_path())
+    if args.command == "import":
+        with open(args.file) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        scenarios = [Scenario(r["name"], r["bear"], r["base"], r["bull"], tuple(r["tracked"]), r.get("custom", {})) for r in records]
+        try:
+            print(f"Saved {store.save_many(scenarios)} scenario(s)")
+        except ValueError as error:
+            parser.error(str(error))
+    else:
+        for name in store.names():
+            print(name)
+
+
+if __name__ == "__main__":
+    main()
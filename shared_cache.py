@@ -0,0 +1,105 @@
+"""Process-wide caches shared by every browser session, with hit/miss counters.
+
+Thin wrappers over ``st.cache_data`` and ``st.cache_resource``: Streamlit
+already keeps these caches per process, so one session's slider position
+is a cache hit for everyone else at the same position. The wrappers require
+a ``max_entries`` bound (least recently used entries are evicted first) and
+count calls and misses per cache, which Streamlit does not expose.
+
+``cache_data`` hands each caller a deserialized copy; ``cache_resource``
+hands every session the same object, so use it only for values nobody
+mutates (arrays are returned read-only).
+"""
+import functools
+import threading
+
+import numpy as np
+import streamlit as st
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def _bump(self, name, index):
+        with self._lock:
+            counts = self._counts.setdefault(name, [0, 0])
+            counts[index] += 1
+
+    def call(self, name):
+        self._bump(name, 0)
+
+    def miss(self, name):
+        self._bump(name, 1)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+    def snapshot(self):
+        """One row per cache: calls, hits, misses and hit rate."""
+        with self._lock:
+            counts = {name: tuple(values) for name, values in self._counts.items()}
+        return [
+            {"cache": name, "calls": calls, "hits": calls - misses, "misses": misses, "hit_rate": (calls - misses) / calls if calls else 0.0}
+            for name, (calls, misses) in sorted(counts.items())
+        ]
+
+
+STATS = CacheStats()
+# Streamlit's cache name (module.qualname) -> counter name
+_NAMES = {}
+
+
+def _counted(cache, name, max_entries, **kwargs):
+    def decorator(func):
+        name_ = name or func.__name__
+        _NAMES[f"{func.__module__}.{func.__qualname__}"] = name_
+
+        # Only runs on a miss; wraps() keeps the cache key tied to func's own name and source
+        @functools.wraps(func)
+        def compute(*args, **kw):
+            STATS.miss(name_)
+            return func(*args, **kw)
+
+        cached = cache(max_entries=max_entries, **kwargs)(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kw):
+            STATS.call(name_)
+            return cached(*args, **kw)
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
+
+def shared_data(max_entries, name=None, **kwargs):
+    """``st.cache_data`` with a required size bound and hit/miss counting."""
+    return _counted(st.cache_data, name, max_entries, **kwargs)
+
+
+def shared_resource(max_entries, name=None, **kwargs):
+    """``st.cache_resource`` with a required size bound and hit/miss counting."""
+    return _counted(st.cache_resource, name, max_entries, **kwargs)
+
+
+def read_only(*arrays):
+    # Shared resources must not be modified in place by any session
+    for array in arrays:
+        if isinstance(array, np.ndarray):
+            array.setflags(write=False)
+    return arrays[0] if len(arrays) == 1 else arrays
+
+
+def memory_by_cache():
+    """Bytes held by each counted ``st.cache_data`` cache, from Streamlit's stats provider."""
+    from streamlit.runtime.caching import get_data_cache_stats_provider
+
+    totals = {}
+    for stats in get_data_cache_stats_provider().get_stats().values():
+        for stat in stats:
+            name = _NAMES.get(stat.cache_name, stat.cache_name)
+            totals[name] = totals.get(name, 0) + stat.byte_length
+    return totals
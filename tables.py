@@ -0,0 +1,61 @@
+"""Server-side paginated, sortable tables.
+
+``paged_table`` keeps the full frame on the server: filtering, sorting and
+paging run in pandas/NumPy, and only the visible page is sent to the
+browser as a dataframe element. The controls live in a fragment, so
+paging or re-sorting reruns just the table, and the frame passed in is
+never copied; only the page rows are taken from it.
+"""
+import numpy as np
+import streamlit as st
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+def page_rows(frame, sort_by=None, descending=False, query="", search_column=None):
+    """Row positions of ``frame`` after filtering and sorting, as an int array.
+
+    ``query`` keeps rows whose ``search_column`` contains it (case-insensitive).
+    Sorting is stable; missing values go last either way.
+    """
+    positions = np.arange(len(frame))
+    if query and search_column is not None:
+        mask = frame[search_column].astype(str).str.contains(query, case=False, regex=False).to_numpy()
+        positions = positions[mask]
+    if sort_by is not None:
+        values = frame[sort_by].iloc[positions].reset_index(drop=True)
+        order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+        positions = positions[order]
+    return positions
+
+
+@st.fragment
+def paged_table(frame, key, column_config=None, search_column=None, page_size=50):
+    """Render one page of ``frame`` with filter, sort and page controls keyed by ``key``."""
+    columns = list(frame.columns)
+    filter_col, sort_col, order_col, size_col = st.columns([3, 3, 2, 2])
+    with filter_col:
+        query = st.text_input("Filter", key=f"{key}_filter", placeholder=f"{search_column} contains..." if search_column else "",
+                              disabled=search_column is None)
+    with sort_col:
+        sort_by = st.selectbox("Sort by", columns, key=f"{key}_sort")
+    with order_col:
+        descending = st.toggle("Descending", key=f"{key}_descending")
+    with size_col:
+        size = st.selectbox("Rows", PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1, key=f"{key}_size")
+
+    positions = page_rows(frame, sort_by, descending, query, search_column)
+    pages = max(1, -(-len(positions) // size))
+    page = 1
+    if pages > 1:
+        if st.session_state.get(f"{key}_page", 1) > pages:
+            st.session_state[f"{key}_page"] = pages
+        page = st.number_input("Page", 1, pages, step=1, key=f"{key}_page")
+
+    visible = positions[(page - 1) * size:page * size]
+    st.dataframe(frame.iloc[visible], width="stretch", hide_index=True, column_config=column_config)
+    if len(positions):
+        st.caption(f"Rows {(page - 1) * size + 1:,}–{(page - 1) * size + len(visible):,} of {len(positions):,}"
+                   + (f" (filtered from {len(frame):,})" if len(positions) < len(frame) else ""))
+    else:
+        st.caption(f"No rows match (of {len(frame):,})")
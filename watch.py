@@ -0,0 +1,161 @@
+"""Watched competitor file with incremental result updates.
+
+``WatchedCompanies`` polls the company file from a daemon thread. When the
+content hash changes it parses the new file, diffs it against the current
+table by company name and publishes the new table under a new version,
+together with the names whose FTE or metadata changed (or that were added).
+The table object is replaced, never mutated, so readers on other threads
+always see a consistent one.
+
+``ScenarioResultsCache`` keeps companies x scenarios ARR per (scenario
+values, overrides). When the table moves to a newer version, a cached
+matrix is patched instead of dropped: unchanged companies are carried over
+by name and only the changed ones are recomputed.
+"""
+import logging
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+from companies import file_digest, read_companies
+from engine import SCENARIOS, compute_arr, scenario_matrix
+
+logger = logging.getLogger("acryl.watch")
+
+
+def changed_companies(old, new):
+    """Names in ``new`` that are missing from ``old`` or differ in any column."""
+    common = new.index.intersection(old.index)
+    before, after = old.loc[common], new.loc[common]
+    differs = np.zeros(len(common), dtype=bool)
+    for column in new.columns:
+        a, b = before[column].astype(object).to_numpy(), after[column].astype(object).to_numpy()
+        differs |= ~((a == b) | (pd.isna(a) & pd.isna(b)))
+    return set(new.index.difference(old.index)) | set(common[differs])
+
+
+class WatchedCompanies:
+    def __init__(self, path, interval=2.0, history=64):
+        self.path = str(path)
+        self.interval = interval
+        # (version, table, digest), replaced in one assignment so readers never see a mix
+        digest = file_digest(self.path)
+        self.current = (0, read_companies(self.path), digest)
+        # (version, names changed by that version); older versions force a full recompute
+        self._changes = deque(maxlen=history)
+        # Why the file on disk is not being served, or None while it is
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def version(self):
+        return self.current[0]
+
+    @property
+    def table(self):
+        return self.current[1]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="company-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as error:
+                # A half-written or invalid file: keep serving the last good table and keep polling
+                message = f"{type(error).__name__}: {error}"
+                if message != self.error:
+                    logger.exception("Could not read %s; keeping the last good table", self.path)
+                self.error = message
+            else:
+                self.error = None
+
+    def refresh(self):
+        """Pick up a changed file. Returns True if a new version was published."""
+        version, old, old_digest = self.current
+        digest = file_digest(self.path)
+        if digest == old_digest:
+            return False
+        table = read_companies(self.path)
+        self._changes.append((version + 1, frozenset(changed_companies(old, table))))
+        self.current = (version + 1, table, digest)
+        return True
+
+    def changed_since(self, version, until):
+        """Names changed after ``version`` up to ``until``, or None when that is no longer known."""
+        changes = [(v, names) for v, names in list(self._changes) if version < v <= until]
+        if len(changes) != until - version:
+            return None
+        return set().union(*(names for _, names in changes))
+
+
+class ScenarioResultsCache:
+    """Scenarios x companies ARR frames per (scenario values, overrides), patched as the table changes.
+
+    ``overrides`` holds (company, custom ARR per FTE) pairs; other companies'
+    custom value is the second scenario value (the base case). ``compute``
+    optionally supplies a full matrix on a miss (e.g. from a lookup table)
+    and may return None to fall back to broadcasting.
+    """
+
+    def __init__(self, max_entries=256, on_call=None, on_miss=None):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._on_call = on_call or (lambda: None)
+        self._on_miss = on_miss or (lambda: None)
+
+    def get(self, watched, current, scenario_values, overrides, compute=None):
+        """Frame for the ``current`` snapshot of ``watched`` (read once by the caller)."""
+        self._on_call()
+        key = (watched.path, tuple(scenario_values), tuple(overrides))
+        version, table, _ = current
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] > version:
+            # Another session already moved this entry to a newer table; leave it there
+            return self._frame(self._arr(table, scenario_values, overrides), table)
+        if cached is not None and cached[0] < version:
+            changed = watched.changed_since(cached[0], version)
+            cached = None if changed is None else (version, self._patch(cached[1], table, changed, scenario_values, overrides))
+        if cached is None:
+            self._on_miss()
+            arr = compute(table) if compute is not None else None
+            if arr is None:
+                arr = self._arr(table, scenario_values, overrides)
+            cached = (version, self._frame(arr, table))
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached[1]
+
+    @staticmethod
+    def _arr(table, scenario_values, overrides):
+        custom = pd.Series(dict(overrides), dtype=np.float64).reindex(table.index).to_numpy()
+        return compute_arr(table["fte"].to_numpy(), scenario_matrix(scenario_values, custom, scenario_values[1])).T
+
+    @staticmethod
+    def _frame(arr, table):
+        arr.setflags(write=False)
+        return pd.DataFrame(arr, index=list(SCENARIOS), columns=table.index, copy=False)
+
+    def _patch(self, frame, table, changed, scenario_values, overrides):
+        keep = frame.columns.get_indexer(table.index)
+        stale = (keep < 0) | table.index.isin(list(changed))
+        arr = np.empty((len(SCENARIOS), len(table)))
+        arr[:, ~stale] = frame.to_numpy()[:, keep[~stale]]
+        if stale.any():
+            arr[:, stale] = self._arr(table[stale], scenario_values, overrides)
+        return self._frame(arr, table)